@@ -1,5 +1,10 @@
 from typing import Dict, List
 
+import numpy as np
+
+REQUIRED_FIELDS = ("base_cost", "efficiency_factor", "installation_complexity", "processing_capacity")
+SCALE_EXPONENT = 0.6  # Six-tenths rule exponent
+
 
 def calculate_equipment_costs(equipment_list: List[Dict[str, float]]) -> float:
     """
@@ -27,29 +32,36 @@ def calculate_equipment_costs(equipment_list: List[Dict[str, float]]) -> float:
     if not equipment_list:
         raise ValueError("Equipment list cannot be empty")
 
-    total = 0.0
-    SCALE_EXPONENT = 0.6  # Six-tenths rule exponent
-
     for eq in equipment_list:
         # Validate required fields
-        required_fields = ["base_cost", "efficiency_factor", "installation_complexity", "processing_capacity"]
-        if not all(field in eq for field in required_fields):
-            raise ValueError(f"Equipment must contain all required fields: {required_fields}")
-
-        # Apply six-tenths rule for capacity scaling
-        reference_capacity = eq.get('reference_capacity', eq['processing_capacity'])
-        if reference_capacity <= 0:
-            raise ValueError(f"Reference capacity must be positive for equipment: {eq.get('name', 'unknown')}")
-        
-        capacity_ratio = eq['processing_capacity'] / reference_capacity
-        if capacity_ratio <= 0:
-            raise ValueError(f"Invalid capacity ratio for equipment: {eq.get('name', 'unknown')}")
-        
-        # Calculate scaled cost using six-tenths rule
-        scaled_cost = eq['base_cost'] * (capacity_ratio ** SCALE_EXPONENT)
-        
-        # Apply efficiency and complexity factors
-        adjusted_cost = scaled_cost * eq['efficiency_factor'] * eq['installation_complexity']
-        total += adjusted_cost
-
-    return total
+        if not all(field in eq for field in REQUIRED_FIELDS):
+            raise ValueError(f"Equipment must contain all required fields: {list(REQUIRED_FIELDS)}")
+
+    n = len(equipment_list)
+
+    def column(values) -> np.ndarray:
+        return np.fromiter(values, dtype=np.float64, count=n)
+
+    base_cost = column(eq['base_cost'] for eq in equipment_list)
+    efficiency = column(eq['efficiency_factor'] for eq in equipment_list)
+    complexity = column(eq['installation_complexity'] for eq in equipment_list)
+    capacity = column(eq['processing_capacity'] for eq in equipment_list)
+    reference_capacity = column(
+        eq.get('reference_capacity', eq['processing_capacity']) for eq in equipment_list
+    )
+
+    # Vectorized bounds checks; report the first offending item by name
+    invalid = np.flatnonzero(reference_capacity <= 0)
+    if invalid.size:
+        name = equipment_list[invalid[0]].get('name', 'unknown')
+        raise ValueError(f"Reference capacity must be positive for equipment: {name}")
+
+    capacity_ratio = capacity / reference_capacity
+    invalid = np.flatnonzero(capacity_ratio <= 0)
+    if invalid.size:
+        name = equipment_list[invalid[0]].get('name', 'unknown')
+        raise ValueError(f"Invalid capacity ratio for equipment: {name}")
+
+    # Six-tenths capacity scaling, then efficiency and complexity adjustments
+    adjusted_cost = base_cost * capacity_ratio ** SCALE_EXPONENT * efficiency * complexity
+    return float(adjusted_cost.sum())
@@ -45,6 +45,12 @@ class CapitalExpenditureAnalysis:
         self._indirect_factors.append(factor)
         self._invalidate_cache()
 
+    def clear(self) -> None:
+        """Reset equipment, indirect factors and cached results so the instance can be reused"""
+        self._equipment_list.clear()
+        self._indirect_factors.clear()
+        self._invalidate_cache()
+
     def _invalidate_cache(self) -> None:
         """Invalidate cached calculations when data changes"""
         self._cached_results = None
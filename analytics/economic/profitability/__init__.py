@@ -1,10 +1,11 @@
-from .npv import calculate_npv
+from .npv import calculate_npv, discount_cash_flows
 from .roi import calculate_roi
 from .payback import calculate_payback_period
 from .mcsp import calculate_mcsp
 
 __all__ = [
     'calculate_npv',
+    'discount_cash_flows',
     'calculate_roi',
     'calculate_payback_period',
     'calculate_mcsp'
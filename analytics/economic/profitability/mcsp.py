@@ -33,25 +33,20 @@ def calculate_mcsp(
     else:
         rng = np.random.RandomState()
 
-    npvs = []
-    mcsps = []
-
-    # Monte Carlo simulation
-    for _ in range(iterations):
-        # Sample cash flows with uncertainty using numpy's RNG
-        sampled_flows = [cf * (1 + rng.uniform(-0.1, 0.1)) for cf in cash_flows]
-
-        # Calculate NPV for this iteration
-        npv = sum(cf / (1 + discount_rate) ** i for i, cf in enumerate(sampled_flows))
-        npvs.append(npv)
-
-        # Calculate MCSP for this iteration
-        if production_volume > 0:
-            mcsp = (target_npv - npv) / (
-                production_volume
-                * sum(1 / (1 + discount_rate) ** i for i in range(len(cash_flows)))
-            )
-            mcsps.append(mcsp)
+    flows = np.asarray(cash_flows, dtype=np.float64)
+    discount_factors = 1.0 / np.power(1.0 + discount_rate, np.arange(flows.size, dtype=np.float64))
+
+    # Monte Carlo simulation: one row of sampled cash flows per iteration. The
+    # uniform draws fill the matrix row by row, in the same order as drawing
+    # them one cash flow at a time, so seeded runs are unchanged.
+    sampled_flows = flows * (1 + rng.uniform(-0.1, 0.1, size=(iterations, flows.size)))
+    npvs = sampled_flows @ discount_factors
+
+    # Calculate MCSP for every iteration against the same discounted volume
+    if production_volume > 0:
+        mcsps = (target_npv - npvs) / (production_volume * discount_factors.sum())
+    else:
+        mcsps = np.empty(0)
 
     # Calculate statistics
     mean_mcsp = np.mean(mcsps)
@@ -1,5 +1,8 @@
+from functools import lru_cache
 from typing import List, Dict
 
+import numpy as np
+
 
 def calculate_npv(
     cash_flows: List[float], discount_rate: float, initial_investment: float = 0.0
@@ -58,3 +61,29 @@ def calculate_npv(
         "discounted_flows": discounted_flows,
         "cumulative_npv": cumulative_npv,
     }
+
+
+@lru_cache(maxsize=256)
+def _discount_factors(periods: int, discount_rate: float) -> np.ndarray:
+    """Read-only 1 / (1 + r)^t factors for t = 1..periods, shared across requests"""
+    factors = 1.0 / np.power(1.0 + discount_rate, np.arange(1, periods + 1, dtype=np.float64))
+    factors.flags.writeable = False
+    return factors
+
+
+def discount_cash_flows(cash_flows: List[float], discount_rate: float) -> np.ndarray:
+    """
+    Discount a series of yearly cash flows to present value in one pass.
+
+    The first cash flow is discounted by one period, matching calculate_npv:
+    DCFt = CFt / (1 + r)^t for t = 1..n
+
+    Args:
+        cash_flows: List of future cash flows, starting at period 1
+        discount_rate: Annual discount rate (as decimal)
+
+    Returns:
+        Array of discounted cash flows
+    """
+    flows = np.asarray(cash_flows, dtype=np.float64)
+    return flows * _discount_factors(flows.size, float(discount_rate))
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional, Union, Any
 from dataclasses import dataclass
-from analytics.economic.profitability.npv import calculate_npv
+from analytics.economic.profitability.npv import calculate_npv, discount_cash_flows
 from analytics.economic.profitability.roi import calculate_roi
 from analytics.economic.profitability.payback import calculate_payback_period
 from analytics.economic.profitability.mcsp import calculate_mcsp
@@ -247,14 +247,10 @@ class ProfitabilityAnalysis:
             )
             logger.debug(f"Monte Carlo results: {monte_carlo_results}")
 
-            # Calculate discounted cash flows for ROI
-            discounted_flows = []
-            for t, cf in enumerate(cash_flows[1:], 1):  # Start from year 1
-                discounted_cf = cf / ((1 + self.parameters.discount_rate) ** t)
-                discounted_flows.append(discounted_cf)
-            
-            # Calculate ROI using discounted values
-            total_discounted_gain = sum(discounted_flows)
+            # Calculate ROI using discounted values from year 1 onwards
+            total_discounted_gain = float(
+                discount_cash_flows(cash_flows[1:], self.parameters.discount_rate).sum()
+            )
             roi_results = calculate_roi(
                 gain_from_investment=total_discounted_gain,
                 cost_of_investment=initial_investment,
@@ -303,14 +299,10 @@ class ProfitabilityAnalysis:
                 'unit': 'USD'
             }
 
-            # Calculate discounted cash flows for ROI
-            discounted_flows = []
-            for t, cf in enumerate(cash_flows[1:], 1):  # Start from year 1
-                discounted_cf = cf / ((1 + self.parameters.discount_rate) ** t)
-                discounted_flows.append(discounted_cf)
-
-            # Calculate ROI using discounted values
-            total_discounted_gain = sum(discounted_flows)
+            # Calculate ROI using discounted values from year 1 onwards
+            total_discounted_gain = float(
+                discount_cash_flows(cash_flows[1:], self.parameters.discount_rate).sum()
+            )
             roi_results = calculate_roi(
                 gain_from_investment=total_discounted_gain,
                 cost_of_investment=initial_investment,
@@ -403,27 +395,26 @@ class ProfitabilityAnalysis:
                 logger.info(f"First few values: {sensitivity_values[:3]}...")
                 
                 # Calculate range values for x-axis
-                range_values = [
-                    range_min + i * (range_max - range_min) / steps
-                    for i in range(steps + 1)
-                ]
+                range_values = np.linspace(range_min, range_max, steps + 1)
                 
                 # Calculate base value (middle point)
                 base_value = range_min + (range_max - range_min) / 2
                 
                 # Calculate base case NPV for percent changes
-                base_npv = sensitivity_values[steps//2]
+                base_npv = float(sensitivity_values[steps//2])
                 logger.info(f"Base NPV for {var}: {base_npv}")
                 
+                if base_npv != 0:
+                    percent_change = (sensitivity_values - base_npv) * (100.0 / abs(base_npv))
+                else:
+                    percent_change = np.zeros_like(sensitivity_values)
+                
                 results[var] = {
-                    "values": sensitivity_values,
-                    "range": range_values,
+                    "values": sensitivity_values.tolist(),
+                    "range": range_values.tolist(),
                     "base_value": base_value,
                     "base_npv": base_npv,
-                    "percent_change": [
-                        ((val - base_npv) / abs(base_npv)) * 100 if base_npv != 0 else 0.0
-                        for val in sensitivity_values
-                    ]
+                    "percent_change": percent_change.tolist()
                 }
                 logger.info(f"Completed analysis for {var}")
                 logger.info(f"Range values: {range_values[:3]}... to {range_values[-3:]}")
@@ -26,9 +26,8 @@ def estimate_annual_costs(
     Based on paper Section 3.2.3
     """
     # Calculate annual capital charge using capital recovery factor
-    capital_recovery_factor = (interest_rate * (1 + interest_rate) ** project_years) / (
-        (1 + interest_rate) ** project_years - 1
-    )
+    compound_factor = (1 + interest_rate) ** project_years
+    capital_recovery_factor = (interest_rate * compound_factor) / (compound_factor - 1)
     annual_capital_charge = capex * capital_recovery_factor
 
     # Sum up all operational expenses
@@ -1,23 +1,39 @@
-from typing import Dict, Any, Optional, List
+from typing import Deque, Dict, Any, Optional, List
 from datetime import datetime
 import logging
-from collections import defaultdict
+import threading
+from collections import defaultdict, deque
 
 logger = logging.getLogger(__name__)
 
+# Oldest entries are dropped once the history reaches this size
+MAX_HISTORY_ENTRIES = 100_000
+
 class CostTracker:
     """Tracks and analyzes cost data over time"""
     
-    def __init__(self):
-        self.cost_history: List[Dict[str, Any]] = []
+    def __init__(self, max_entries: int = MAX_HISTORY_ENTRIES):
+        self.cost_history: Deque[Dict[str, Any]] = deque(maxlen=max_entries)
+        # Parsed timestamps aligned with cost_history, so date filters do not
+        # re-parse every entry's ISO string
+        self._entry_times: Deque[datetime] = deque(maxlen=max_entries)
+        # track_costs may run from background tasks in worker threads
+        self._lock = threading.Lock()
         
     def track_costs(self, cost_data: Dict[str, Any]) -> None:
         """Add cost data to tracking history"""
         try:
             # Ensure all numeric values are floats
             sanitized_data = self._sanitize_numeric_values(cost_data)
-            sanitized_data['timestamp'] = datetime.now().isoformat()
-            self.cost_history.append(sanitized_data)
+            # Keep a caller-supplied timestamp so the entry matches its analysis
+            if 'timestamp' in sanitized_data:
+                entry_time = datetime.fromisoformat(sanitized_data['timestamp'])
+            else:
+                entry_time = datetime.now()
+                sanitized_data['timestamp'] = entry_time.isoformat()
+            with self._lock:
+                self.cost_history.append(sanitized_data)
+                self._entry_times.append(entry_time)
         except Exception as e:
             logger.error(f"Error tracking costs: {str(e)}")
             raise ValueError(f"Failed to track costs: {str(e)}")
@@ -62,17 +78,15 @@ class CostTracker:
     ) -> List[Dict[str, Any]]:
         """Filter cost history by date range"""
         if not (start_date or end_date):
-            return self.cost_history
+            return list(self.cost_history)
             
-        filtered = []
-        for entry in self.cost_history:
-            entry_date = datetime.fromisoformat(entry['timestamp'])
-            if start_date and entry_date < start_date:
-                continue
-            if end_date and entry_date > end_date:
-                continue
-            filtered.append(entry)
-        return filtered
+        with self._lock:
+            timeline = list(zip(self._entry_times, self.cost_history))
+        return [
+            entry for entry_date, entry in timeline
+            if not (start_date and entry_date < start_date)
+            and not (end_date and entry_date > end_date)
+        ]
 
     def _aggregate_costs(self, cost_data: Dict[str, Any], summary: Dict[str, float]) -> None:
         """Recursively aggregate costs from nested structure"""
@@ -88,7 +102,8 @@ class CostTracker:
         """Get cost trends over time"""
         try:
             trends = defaultdict(list)
-            for entry in self.cost_history:
+            # Iterate a snapshot; a deque cannot be appended to while being iterated
+            for entry in list(self.cost_history):
                 timestamp = entry.get('timestamp')
                 if not timestamp:
                     continue
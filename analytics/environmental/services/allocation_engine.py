@@ -1,8 +1,64 @@
-from typing import Dict, List, Optional, Literal
+from typing import Dict, List, Optional, Literal, Sequence
+import logging
+import numpy as np
 from ..allocation.economic import EconomicAllocator
 from ..allocation.physical import PhysicalAllocator
 from ..allocation.hybrid import HybridAllocator
 
+logger = logging.getLogger(__name__)
+
+# RF Treatment allocation factors reported in the research
+RF_ALLOCATION_FACTORS = {
+    'economic': 0.449,
+    'physical': 0.219
+}
+
+def check_protein_yield(mass_flows: Dict[str, float]) -> None:
+    """Warn when the protein concentrate yield is outside the RF research range (21.9% ± 2%)"""
+    total_mass = sum(mass_flows.values())
+    protein_yield = mass_flows.get('protein_concentrate', 0) / total_mass if total_mass > 0 else 0
+    if not (0.199 <= protein_yield <= 0.239):
+        logger.warning(
+            "Protein yield %.3f is outside expected range for RF treatment (0.199-0.239)", protein_yield
+        )
+
+def allocate_with_factors(impacts: Dict[str, float],
+                          products: Sequence[str],
+                          factors: np.ndarray,
+                          method: Literal['economic', 'physical', 'hybrid']
+                          ) -> Dict[str, Dict[str, float]]:
+    """Allocate every impact category with precomputed per-product factors
+    
+    Stateless counterpart of AllocationEngine.allocate_impacts, safe to call
+    concurrently.
+    
+    Args:
+        impacts: Dictionary mapping impact categories to total values
+        products: Product names, in the order of factors
+        factors: Allocation factor of each product (summing to 1)
+        method: Allocation method the factors were computed with
+        
+    Returns:
+        Nested dictionary mapping impact categories to allocated impacts per product
+    """
+    impact_totals = np.fromiter(impacts.values(), dtype=np.float64, count=len(impacts))
+    allocated_rows = np.outer(impact_totals, factors).tolist()
+    
+    # Validate allocation results against research factors
+    if method in RF_ALLOCATION_FACTORS and impacts and 'protein_concentrate' in products:
+        protein_factor = float(factors[list(products).index('protein_concentrate')])
+        expected_factor = RF_ALLOCATION_FACTORS[method]
+        if abs(protein_factor - expected_factor) > 0.05:  # 5% tolerance
+            logger.warning(
+                "Calculated allocation factor %.3f differs significantly from research factor %.3f",
+                protein_factor, expected_factor
+            )
+    
+    return {
+        impact_category: dict(zip(products, row))
+        for impact_category, row in zip(impacts, allocated_rows)
+    }
+
 class AllocationEngine:
     """Service for managing environmental impact allocation"""
     
@@ -11,10 +67,7 @@ class AllocationEngine:
         self.physical_allocator = PhysicalAllocator()
         self.hybrid_allocator = HybridAllocator()
         self._hybrid_weights = {'economic': 0.6, 'physical': 0.4}  # Updated based on research
-        self._rf_allocation_factors = {
-            'economic': 0.449,  # RF Treatment economic allocation factor
-            'physical': 0.219   # RF Treatment physical allocation factor
-        }
+        self._rf_allocation_factors = RF_ALLOCATION_FACTORS
         
     def configure_allocation(self,
                            product_values: Dict[str, float],
@@ -28,12 +81,7 @@ class AllocationEngine:
             hybrid_weights: Optional weights for hybrid allocation
         """
         # Validate mass flows against RF research data
-        total_mass = sum(mass_flows.values())
-        protein_yield = mass_flows.get('protein_concentrate', 0) / total_mass if total_mass > 0 else 0
-        
-        # Check if protein yield is within expected range for RF treatment (21.9% ± 2%)
-        if not (0.199 <= protein_yield <= 0.239):
-            print(f"Warning: Protein yield {protein_yield:.3f} is outside expected range for RF treatment (0.199-0.239)")
+        check_protein_yield(mass_flows)
         
         self.economic_allocator.set_product_values(product_values)
         self.physical_allocator.set_mass_flows(mass_flows)
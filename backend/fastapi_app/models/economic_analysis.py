@@ -4,13 +4,10 @@ Shared economic analysis models to ensure consistency across endpoints.
 
 from pydantic import BaseModel, Field, field_validator, ValidationInfo
 from typing import Dict, List, Optional, Any, Union, Tuple
-from enum import Enum
+from functools import cached_property
+import math
 
-
-class ProcessType(str, Enum):
-    BASELINE = 'baseline'
-    RF = 'rf'
-    IR = 'ir'
+from .protein_analysis import ProcessType
 
 
 class EconomicFactors(BaseModel):
@@ -231,6 +228,14 @@ class ComprehensiveAnalysisInput(BaseModel):
     )
     random_seed: Optional[int] = Field(42, description="Random seed for Monte Carlo simulation reproducibility")
 
+    @cached_property
+    def scaled_equipment_cost(self) -> float:
+        """Capacity-scaled equipment cost used as the base for default indirect factors."""
+        return math.fsum(
+            equip.base_cost * (equip.processing_capacity / 1000)
+            for equip in self.equipment_list
+        )
+
     model_config = {
         "json_schema_extra": {
             "examples": [{
@@ -2,10 +2,11 @@
 Shared environmental analysis models to ensure consistency across endpoints.
 """
 
-from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import Dict, List, Optional, Literal, TypedDict, Union, Any
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator, model_validator
+from typing import Dict, List, Optional, Literal, Union, Any
+from dataclasses import dataclass
 from enum import Enum
-import math
+import numpy as np
 
 class AllocationMethod(str, Enum):
     """Valid allocation methods"""
@@ -13,8 +14,61 @@ class AllocationMethod(str, Enum):
     ECONOMIC = "economic"
     HYBRID = "hybrid"
 
+@dataclass(frozen=True)
+class ProcessInputsData:
+    """Validated process inputs as a compact, hashable record for internal pipelines."""
+    __slots__ = (
+        "rf_electricity_kwh",
+        "rf_temperature_outfeed_c",
+        "rf_temperature_electrode_c",
+        "rf_frequency_mhz",
+        "rf_anode_current_a",
+        "rf_grid_current_a",
+        "air_classifier_milling_kwh",
+        "air_classification_kwh",
+        "hammer_milling_kwh",
+        "dehulling_kwh",
+        "tempering_water_kg",
+        "initial_moisture_content",
+        "final_moisture_content",
+        "target_moisture_content",
+        "product_kg",
+        "equipment_kg",
+        "waste_kg",
+        "transport_ton_km",
+        "conveyor_speed_m_min",
+        "material_depth_mm",
+        "electrode_gap_mm",
+        "thermal_ratio",
+    )
+
+    rf_electricity_kwh: float
+    rf_temperature_outfeed_c: float
+    rf_temperature_electrode_c: float
+    rf_frequency_mhz: float
+    rf_anode_current_a: float
+    rf_grid_current_a: float
+    air_classifier_milling_kwh: float
+    air_classification_kwh: float
+    hammer_milling_kwh: float
+    dehulling_kwh: float
+    tempering_water_kg: float
+    initial_moisture_content: float
+    final_moisture_content: float
+    target_moisture_content: float
+    product_kg: float
+    equipment_kg: float
+    waste_kg: float
+    transport_ton_km: float
+    conveyor_speed_m_min: float
+    material_depth_mm: float
+    electrode_gap_mm: float
+    thermal_ratio: float
+
 class ProcessInputs(BaseModel):
     """Environmental process data model with RF treatment parameters."""
+    model_config = ConfigDict(extra='forbid', frozen=True, allow_inf_nan=False)
+
     # RF Pretreatment Parameters
     rf_electricity_kwh: float = Field(..., gt=0, description="RF unit power consumption in kWh")
     rf_temperature_outfeed_c: float = Field(..., gt=0, le=150, description="RF outfeed temperature in °C")
@@ -47,13 +101,6 @@ class ProcessInputs(BaseModel):
     electrode_gap_mm: float = Field(86.9, gt=0, description="RF electrode gap in mm")
     thermal_ratio: float = Field(0.65, ge=0, le=1, description="Ratio of thermal processing")
 
-    @field_validator('*')
-    @classmethod
-    def validate_positive_numbers(cls, v: float, field: str) -> float:
-        if math.isnan(v) or math.isinf(v):
-            raise ValueError(f"{field} cannot be NaN or infinite")
-        return v
-
     @model_validator(mode='after')
     def validate_moisture_contents(self) -> 'ProcessInputs':
         """Validate moisture content relationships"""
@@ -63,27 +110,54 @@ class ProcessInputs(BaseModel):
             raise ValueError("Target moisture content must be between 12-13% for dehulling")
         return self
 
-class ImpactFactor(TypedDict):
+    def to_data(self) -> ProcessInputsData:
+        """Convert to the slotted record used past the HTTP boundary (no re-validation)."""
+        return ProcessInputsData(**self.__dict__)
+
+@dataclass
+class ImpactFactor:
     """Impact factor definition"""
+    __slots__ = ("value", "unit", "description")
+
     value: float
     unit: str
     description: str
 
-class ProcessContribution(TypedDict):
+@dataclass
+class ProcessContribution:
     """Process contribution definition"""
+    __slots__ = ("value", "unit", "process")
+
     value: float
     unit: str
     process: str
 
-class ImpactResults(TypedDict):
+@dataclass
+class ImpactResults:
     """Environmental impact calculation results."""
+    __slots__ = (
+        "gwp",
+        "hct",
+        "frs",
+        "water_consumption",
+    )
+
     gwp: float
     hct: float
     frs: float
     water_consumption: float
 
-class DetailedImpactResults(TypedDict):
+@dataclass
+class DetailedImpactResults:
     """Detailed impact results including process contributions"""
+    __slots__ = (
+        "total_impacts",
+        "process_contributions",
+        "metadata",
+        "rf_parameters",
+        "process_breakdown",
+    )
+
     total_impacts: ImpactResults
     process_contributions: Dict[str, Dict[str, ProcessContribution]]
     metadata: Dict[str, Union[float, Dict[str, float]]]
@@ -92,12 +166,14 @@ class DetailedImpactResults(TypedDict):
 
 class AllocationWeights(BaseModel):
     """Weights for hybrid allocation."""
+    model_config = ConfigDict(extra='forbid', frozen=True, allow_inf_nan=False)
+
     economic: float = Field(..., ge=0, le=1)
     physical: float = Field(..., ge=0, le=1)
 
     @model_validator(mode='after')
     def validate_weights_sum(self) -> 'AllocationWeights':
-        if not math.isclose(self.economic + self.physical, 1.0, rel_tol=1e-9):
+        if abs(self.economic + self.physical - 1.0) > 1e-9:
             raise ValueError("Weights must sum to 1.0")
         return self
 
@@ -112,21 +188,27 @@ class AllocationRequest(BaseModel):
     @field_validator('impacts', 'product_values', 'mass_flows')
     @classmethod
     def validate_positive_values(cls, v: Dict[str, float]) -> Dict[str, float]:
-        for key, value in v.items():
-            if math.isnan(value) or math.isinf(value):
-                raise ValueError(f"Value for {key} cannot be NaN or infinite")
-            if value < 0:
-                raise ValueError(f"Value for {key} must be positive")
+        keys = list(v)
+        values = np.fromiter(v.values(), dtype=np.float64, count=len(keys))
+        non_finite = ~np.isfinite(values)
+        if non_finite.any():
+            raise ValueError(f"Value for {keys[int(np.argmax(non_finite))]} cannot be NaN or infinite")
+        negative = values < 0
+        if negative.any():
+            raise ValueError(f"Value for {keys[int(np.argmax(negative))]} must be positive")
         return v
 
     @model_validator(mode='after')
     def validate_hybrid_weights(self) -> 'AllocationRequest':
-        if self.method == AllocationMethod.HYBRID and self.hybrid_weights is None:
+        if self.method is AllocationMethod.HYBRID and self.hybrid_weights is None:
             self.hybrid_weights = AllocationWeights(economic=0.5, physical=0.5)
         return self
 
-class AllocationResults(TypedDict):
+@dataclass
+class AllocationResults:
     """Environmental impact allocation results."""
+    __slots__ = ("allocation_factors", "allocated_impacts", "method_used")
+
     allocation_factors: Dict[str, float]
     allocated_impacts: Dict[str, Dict[str, float]]
     method_used: AllocationMethod
@@ -139,18 +221,30 @@ class ProcessAnalysisResponse(BaseModel):
     suggested_allocation_method: Optional[AllocationMethod] = None
     rf_validation: Dict[str, Any]
 
-    @model_validator(mode='after')
-    def validate_impact_results(self) -> 'ProcessAnalysisResponse':
-        if not isinstance(self.impact_results, dict):
+    @model_validator(mode='before')
+    @classmethod
+    def validate_impact_results(cls, data: Any) -> Any:
+        # Checks raw (untrusted) payloads before they are validated into
+        # DetailedImpactResults; the endpoint's own computed results are
+        # trusted and not re-validated
+        if not isinstance(data, dict) or isinstance(data.get("impact_results"), DetailedImpactResults):
+            return data
+        impact_results = data.get("impact_results")
+        if not isinstance(impact_results, dict):
             raise ValueError("impact_results must be a dictionary")
-        if "total_impacts" not in self.impact_results:
+        if "total_impacts" not in impact_results:
             raise ValueError("impact_results must contain total_impacts")
-        if "process_contributions" not in self.impact_results:
+        if "process_contributions" not in impact_results:
             raise ValueError("impact_results must contain process_contributions")
-        if "metadata" not in self.impact_results:
+        if "metadata" not in impact_results:
             raise ValueError("impact_results must contain metadata")
-        if "rf_parameters" not in self.impact_results:
+        if "rf_parameters" not in impact_results:
             raise ValueError("impact_results must contain rf_parameters")
-        if "process_breakdown" not in self.impact_results:
+        if "process_breakdown" not in impact_results:
             raise ValueError("impact_results must contain process_breakdown")
-        return self 
\ No newline at end of file
+        return data
+
+
+# Compiled validator reused by callers that validate raw payloads, so the
+# core schema is resolved once at import rather than on every construction.
+ALLOCATION_REQUEST_ADAPTER = TypeAdapter(AllocationRequest)
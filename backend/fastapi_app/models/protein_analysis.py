@@ -1,6 +1,25 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 from typing import Dict, List, Optional, Union, Tuple
 from enum import Enum
+import sys
+from functools import cached_property
+
+import numpy as np
+
+# Dict keys looked up on every separation request
+_INPUT = sys.intern("input")
+_OUTPUT = sys.intern("output")
+_PROTEIN = sys.intern("protein")
+_PROCESSING_MOISTURE = sys.intern("processing_moisture")
+
+_REQUIRED_MASS_FLOW_KEYS = frozenset((_INPUT, _OUTPUT))
+_REQUIRED_STEP_KEYS = frozenset(("feed_composition", "product_composition", "mass_flow"))
+
+
+
+def _sum_to_100(values: np.ndarray) -> float:
+    """Pairwise-summed total of a composition's percentages."""
+    return float(np.add.reduce(values))
 
 
 class ProcessType(str, Enum):
@@ -10,6 +29,8 @@ class ProcessType(str, Enum):
 
 
 class ProteinRecoveryInput(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True, allow_inf_nan=False)
+
     input_mass: float = Field(..., gt=0, description="Input mass in kg")
     output_mass: float = Field(..., gt=0, description="Output mass in kg")
     initial_protein_content: float = Field(
@@ -25,6 +46,8 @@ class ProteinRecoveryInput(BaseModel):
 
 
 class ProcessStep(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True)
+
     feed_composition: Union[Dict[str, float], str]
     product_composition: Union[Dict[str, float], str]
     mass_flow: Union[Dict[str, float], str]
@@ -41,41 +64,30 @@ class SeparationEfficiencyInput(BaseModel):
     )
     target_purity: Optional[float] = None
 
-    @field_validator("feed_composition")
+    @field_validator("feed_composition", "product_composition")
     @classmethod
-    def validate_feed_composition(cls, v: Dict[str, float]) -> Dict[str, float]:
+    def validate_composition(cls, v: Dict[str, float], info: ValidationInfo) -> Dict[str, float]:
+        label = info.field_name.replace("_", " ").capitalize()
         if not v:
-            raise ValueError("Feed composition cannot be empty")
-        if "protein" not in v:
-            raise ValueError("Feed composition must include protein content")
-        if not all(isinstance(val, (int, float)) and val >= 0 for val in v.values()):
+            raise ValueError(f"{label} cannot be empty")
+        if _PROTEIN not in v:
+            raise ValueError(f"{label} must include protein content")
+        # Values are already coerced to float; check sign and total on one buffer
+        values = np.fromiter(v.values(), dtype=np.float64, count=len(v))
+        if (values < 0).any():
             raise ValueError("All composition values must be non-negative numbers")
-        if abs(sum(v.values()) - 100.0) > 0.1:
-            raise ValueError("Composition percentages must sum to 100%")
-        return v
-
-    @field_validator("product_composition")
-    @classmethod
-    def validate_product_composition(cls, v: Dict[str, float]) -> Dict[str, float]:
-        if not v:
-            raise ValueError("Product composition cannot be empty")
-        if "protein" not in v:
-            raise ValueError("Product composition must include protein content")
-        if not all(isinstance(val, (int, float)) and val >= 0 for val in v.values()):
-            raise ValueError("All composition values must be non-negative numbers")
-        if abs(sum(v.values()) - 100.0) > 0.1:
+        if abs(_sum_to_100(values) - 100.0) > 0.1:
             raise ValueError("Composition percentages must sum to 100%")
         return v
 
     @field_validator("mass_flow")
     @classmethod
     def validate_mass_flow(cls, v: Dict[str, float]) -> Dict[str, float]:
-        required_keys = {"input", "output"}
-        if not all(key in v for key in required_keys):
-            raise ValueError(f"Mass flow must contain all required keys: {required_keys}")
+        if not _REQUIRED_MASS_FLOW_KEYS <= v.keys():
+            raise ValueError(f"Mass flow must contain all required keys: {sorted(_REQUIRED_MASS_FLOW_KEYS)}")
         if not all(isinstance(val, (int, float)) and val > 0 for val in v.values()):
             raise ValueError("All mass flow values must be positive numbers")
-        if v["output"] > v["input"]:
+        if v[_OUTPUT] > v[_INPUT]:
             raise ValueError("Output mass cannot be greater than input mass")
         return v
 
@@ -85,18 +97,18 @@ class SeparationEfficiencyInput(BaseModel):
         if v is None:
             return v
             
+        valid_refs = frozenset(values.data)
         for step in v:
-            required_keys = {"feed_composition", "product_composition", "mass_flow"}
-            if not all(key in step for key in required_keys):
-                raise ValueError(f"Each process step must contain: {required_keys}")
+            if not _REQUIRED_STEP_KEYS <= step.keys():
+                raise ValueError(f"Each process step must contain: {sorted(_REQUIRED_STEP_KEYS)}")
                 
             # Validate references and allow processing_moisture
             for key in step:
-                if key in required_keys:
+                if key in _REQUIRED_STEP_KEYS:
                     value = step[key]
-                    if isinstance(value, str) and value not in values.data:
+                    if isinstance(value, str) and value not in valid_refs:
                         raise ValueError(f"Invalid reference '{value}' in process data")
-                elif key == "processing_moisture":
+                elif key == _PROCESSING_MOISTURE:
                     if not isinstance(step[key], (int, float)):
                         raise ValueError("Processing moisture must be numeric")
                 else:
@@ -167,11 +179,18 @@ class ParticleSizeInput(BaseModel):
     def validate_particle_sizes(cls, v: List[float]) -> List[float]:
         if len(v) < 2:
             raise ValueError("At least 2 particle sizes are required for analysis")
-        if not all(x > 0 for x in v):
+        sizes = np.asarray(v, dtype=np.float64)
+        if not (sizes > 0).all():
             raise ValueError("All particle sizes must be positive")
-        if any(x > 10000 for x in v):  # 10mm upper limit
+        if (sizes > 10000).any():  # 10mm upper limit
             raise ValueError("Particle sizes exceeding 10000 μm are unrealistic for protein processing")
-        return sorted(v)  # Return sorted list for efficiency
+        sizes.sort()
+        return sizes.tolist()
+
+    @cached_property
+    def particle_sizes_np(self) -> np.ndarray:
+        """Sorted particle sizes as a float64 array for quantile calculations."""
+        return np.asarray(self.particle_sizes, dtype=np.float64)
 
     @field_validator("weights")
     @classmethod
@@ -1,190 +1,158 @@
 from fastapi import APIRouter, HTTPException, Response
-from typing import Dict, Optional, List
-from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict, Optional, List, Tuple
+from functools import lru_cache
+import asyncio
 import logging
 import math
-import json
+import os
+import sys
 
-from analytics.environmental.services.allocation_engine import AllocationEngine
+import numpy as np
+import orjson
+
+from analytics.environmental.services.allocation_engine import (
+    allocate_with_factors,
+    check_protein_yield
+)
 from backend.fastapi_app.models.environmental_analysis import (
+    AllocationMethod,
     AllocationRequest
 )
 from .services.rust_handler import RustHandler
+from .utils.routing import ORJSONRoute
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-router = APIRouter(tags=["environmental-allocation"])
-
-class CustomJSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, float):
-            if math.isnan(obj):
-                return 0.0
-            if math.isinf(obj):
-                return float('inf') if obj > 0 else float('-inf')
-        return super().default(obj)
-
-class AllocationRequest(BaseModel):
-    impacts: Dict[str, float]
-    product_values: Dict[str, float]
-    mass_flows: Dict[str, float]
-    method: str = Field(default="hybrid", pattern="^(economic|physical|hybrid)$")
-    hybrid_weights: Optional[Dict[str, float]] = None
-
-    @field_validator('impacts', 'product_values', 'mass_flows')
-    @classmethod
-    def validate_positive_values(cls, v: Dict[str, float]) -> Dict[str, float]:
-        for key, value in v.items():
-            if not isinstance(value, (int, float)):
-                raise ValueError(f"Value for {key} must be a number")
-            if math.isnan(value) or math.isinf(value):
-                raise ValueError(f"Value for {key} cannot be NaN or infinite")
-            if value < 0:
-                raise ValueError(f"Value for {key} must be positive")
-        return v
-
-    @field_validator('hybrid_weights')
-    @classmethod
-    def validate_hybrid_weights(cls, v: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
-        if v is not None:
-            if 'economic' not in v or 'physical' not in v:
-                raise ValueError("Hybrid weights must contain 'economic' and 'physical' keys")
-            if not math.isclose(v['economic'] + v['physical'], 1.0, rel_tol=1e-9):
-                raise ValueError("Hybrid weights must sum to 1.0")
-            for key, value in v.items():
-                if not 0 <= value <= 1:
-                    raise ValueError(f"Weight for {key} must be between 0 and 1")
-        return v
-
-# Initialize services
-allocation_engine = AllocationEngine()
+router = APIRouter(tags=["environmental-allocation"], route_class=ORJSONRoute)
+
+_FLOAT_MAX = sys.float_info.max
+
+def sanitize_floats(obj: Any) -> Any:
+    """Replace NaN with 0.0 and +/-Inf with the largest finite float, recursively"""
+    if isinstance(obj, float):
+        if math.isfinite(obj):
+            return obj
+        if math.isnan(obj):
+            return 0.0
+        return _FLOAT_MAX if obj > 0 else -_FLOAT_MAX
+    if isinstance(obj, dict):
+        return {key: sanitize_floats(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [sanitize_floats(value) for value in obj]
+    return obj
+
+# Initialize services; allocation itself is stateless, so only the Rust
+# library handle is shared between requests
 rust_handler = RustHandler()
 logger.info("Initialized Allocation services")
 
 def create_json_response(content: Dict) -> Response:
-    """Create a JSON response with custom encoder for handling special float values"""
+    """Create a JSON response with orjson, mapping special float values to finite ones"""
     try:
         return Response(
-            content=json.dumps(content, cls=CustomJSONEncoder),
+            content=orjson.dumps(sanitize_floats(content), option=orjson.OPT_SERIALIZE_NUMPY),
             media_type="application/json"
         )
-    except ValueError as e:
-        logger.error(f"JSON serialization error: {str(e)}")
+    except orjson.JSONEncodeError as e:
+        logger.error("JSON serialization error: %s", e)
         raise HTTPException(status_code=500, detail="Error serializing response data")
 
-@router.post("/calculate")
-async def allocate_impacts(request: AllocationRequest):
-    """Allocate environmental impacts between products"""
+# Dashboards and batch jobs resubmit the same product recipe with different
+# impacts, so the per-product arrays are cached on the product data alone
+PREP_CACHE_SIZE = int(os.getenv("ALLOCATION_PREP_CACHE_SIZE", "64"))
+
+@lru_cache(maxsize=PREP_CACHE_SIZE)
+def _prep_arrays(
+    product_values: Tuple[Tuple[str, float], ...],
+    mass_flows: Tuple[Tuple[str, float], ...]
+) -> Tuple[Tuple[str, ...], np.ndarray, np.ndarray]:
+    """Product names with their economic values and mass flows, aligned to product_values order"""
+    products = tuple(product for product, _ in product_values)
+    mass_by_product = dict(mass_flows)
+    economic_values = np.fromiter(
+        (value for _, value in product_values), dtype=np.float64, count=len(products)
+    )
+    mass_values = np.fromiter(
+        (mass_by_product[product] for product in products), dtype=np.float64, count=len(products)
+    )
+    # Cached arrays are shared between requests, so make them read-only
+    economic_values.setflags(write=False)
+    mass_values.setflags(write=False)
+    return products, economic_values, mass_values
+
+def _compute_allocation(request: AllocationRequest) -> Response:
+    """Synchronous allocation; runs in a worker thread off the event loop"""
     try:
-        logger.debug(f"Received allocation request: {request.dict()}")
-        logger.info(f"Starting impact allocation using {request.method} method")
+        logger.debug("Received allocation request: %r", request)
+        logger.info("Starting impact allocation using %s method", request.method.value)
 
         # Validate that product_values and mass_flows have the same keys
-        products = set(request.product_values.keys())
-        if set(request.mass_flows.keys()) != products:
+        # Key views compare as sets without building any; order follows product_values
+        if request.mass_flows.keys() != request.product_values.keys():
             raise ValueError("Product values and mass flows must have the same product keys")
 
         try:
-            # Convert hybrid weights to dictionary if present
-            hybrid_weights_dict = None
-            if request.hybrid_weights:
-                hybrid_weights_dict = {
-                    'economic': request.hybrid_weights.economic,
-                    'physical': request.hybrid_weights.physical
-                }
-
-            # Configure allocation engine with process data
-            allocation_engine.configure_allocation(
-                product_values=request.product_values,
-                mass_flows=request.mass_flows,
-                hybrid_weights=hybrid_weights_dict
+            # Validate mass flows against RF research data
+            check_protein_yield(request.mass_flows)
+
+            # Per-product arrays in product_values order, shared across requests
+            # with the same product set and values
+            products_list, economic_values, mass_values = _prep_arrays(
+                tuple(request.product_values.items()),
+                tuple(request.mass_flows.items())
             )
 
-            # Convert dictionary values to lists, ensuring matching order
-            products_list = list(products)
-            impact_values = []
-            for impact_type in request.impacts.values():
-                # Replicate impact value for each product to match length
-                impact_values.extend([impact_type] * len(products_list))
-
             # Use Rust for performance-critical calculations
-            if request.method == "economic":
-                # Get economic allocation factors using Rust
-                economic_values = [request.product_values[product] for product in products_list]
-                economic_values = economic_values * len(request.impacts)  # Replicate for each impact type
-                rust_results = rust_handler.calculate_allocation_factors(
-                    impact_values,
-                    economic_values
-                )
-                allocation_factors = rust_results["allocation_factors"]
-            elif request.method == "physical":
-                # Get physical allocation factors using Rust
-                mass_values = [request.mass_flows[product] for product in products_list]
-                mass_values = mass_values * len(request.impacts)  # Replicate for each impact type
-                rust_results = rust_handler.calculate_allocation_factors(
-                    impact_values,
-                    mass_values
-                )
-                allocation_factors = rust_results["allocation_factors"]
+            if request.method is AllocationMethod.ECONOMIC:
+                # Economic factors depend only on the per-product values
+                factors = rust_handler.calculate_allocation_shares(economic_values)
+            elif request.method is AllocationMethod.PHYSICAL:
+                # Physical factors depend only on the per-product mass flows
+                factors = rust_handler.calculate_allocation_shares(mass_values)
             else:  # hybrid
-                # Calculate hybrid allocation using both services
-                weights = hybrid_weights_dict or {"physical": 0.5, "economic": 0.5}
-                
-                # Get base factors using Rust with matched lengths
-                economic_values = [request.product_values[product] for product in products_list]
-                economic_values = economic_values * len(request.impacts)
-                mass_values = [request.mass_flows[product] for product in products_list]
-                mass_values = mass_values * len(request.impacts)
-                
-                economic_results = rust_handler.calculate_allocation_factors(
-                    impact_values,
-                    economic_values
-                )
-                physical_results = rust_handler.calculate_allocation_factors(
-                    impact_values,
-                    mass_values
-                )
-                
-                # Calculate final hybrid factors
-                allocation_factors = rust_handler.calculate_hybrid_allocation_factors(
-                    physical_results["allocation_factors"],
-                    economic_results["allocation_factors"],
-                    weights["physical"]
+                # The request model defaults hybrid weights to an even split
+                physical_weight = request.hybrid_weights.physical if request.hybrid_weights else 0.5
+
+                # One Rust call on the per-product vectors; the factors do not
+                # depend on the impact values, so nothing is replicated
+                factors = rust_handler.calculate_hybrid_allocation_batch(
+                    economic_values,
+                    mass_values,
+                    physical_weight
                 )
 
-            # Use allocation engine to get final allocated impacts
-            allocated_impacts = allocation_engine.allocate_impacts(
+            # Every method yields per-product shares, so the allocated impacts
+            # are one outer product with the impact totals
+            allocated_impacts = allocate_with_factors(
                 request.impacts,
-                method=request.method
+                products_list,
+                factors,
+                request.method.value
             )
+            allocation_factors = dict(zip(products_list, factors.tolist()))
 
             # Map results back to product keys
             allocated_results = {
-                "allocation_factors": dict(zip(products_list, allocation_factors[:len(products_list)])),
+                "allocation_factors": allocation_factors,
                 "allocated_impacts": allocated_impacts,
                 "method_used": request.method
             }
 
             logger.info("Impact allocation completed successfully")
             
-            # Get allocation factors based on method
-            method_factors = allocation_engine.get_allocation_factors(
-                'hybrid' if request.method == 'hybrid' else request.method
-            )
-            
             return create_json_response({
                 "status": "success",
                 "method": request.method,
                 "results": allocated_results,
-                "allocation_factors": method_factors
+                "allocation_factors": allocation_factors
             })
 
         except ValueError as e:
-            logger.error(f"Validation error: {str(e)}")
+            logger.error("Validation error: %s", e)
             raise HTTPException(status_code=422, detail=str(e))
         except RuntimeError as e:
-            logger.error(f"Calculation error: {str(e)}")
+            logger.error("Calculation error: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
 
     except HTTPException:
@@ -194,17 +162,21 @@ async def allocate_impacts(request: AllocationRequest):
         logger.error(error_msg, exc_info=True)
         raise HTTPException(status_code=500, detail=error_msg)
 
+@router.post("/calculate")
+async def allocate_impacts(request: AllocationRequest):
+    """Allocate environmental impacts between products"""
+    # ctypes drops the GIL for the Rust calls, so the worker thread overlaps
+    # with other requests on the event loop
+    return await asyncio.to_thread(_compute_allocation, request)
+
+# Static payload, serialized once at import
+_ALLOCATION_METHODS_JSON = orjson.dumps({
+    "economic": "Allocation based on economic value of products ($/kg)",
+    "physical": "Allocation based on mass flows of products (kg)",
+    "hybrid": "Combined economic and physical allocation with configurable weights"
+})
+
 @router.get("/methods")
 async def get_allocation_methods():
     """Get available allocation methods and their descriptions"""
-    try:
-        logger.debug("Retrieving allocation methods")
-        return create_json_response({
-            "economic": "Allocation based on economic value of products ($/kg)",
-            "physical": "Allocation based on mass flows of products (kg)",
-            "hybrid": "Combined economic and physical allocation with configurable weights"
-        })
-    except Exception as e:
-        error_msg = f"Error retrieving allocation methods: {str(e)}"
-        logger.error(error_msg, exc_info=True)
-        raise HTTPException(status_code=500, detail=error_msg) 
\ No newline at end of file
+    return Response(content=_ALLOCATION_METHODS_JSON, media_type="application/json") 
\ No newline at end of file
@@ -8,10 +8,16 @@ This module provides FastAPI endpoints for economic analysis including:
 - Business Metrics and Performance Indicators
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query, Response
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+from typing import Annotated, List, Dict, Any, Optional, Tuple
+from functools import lru_cache
+from operator import attrgetter
+import asyncio
 import logging
+import queue
+
+import numpy as np
 from datetime import datetime
 
 # Configure module logger with full package path
@@ -24,46 +30,109 @@ from analytics.economic.services.cost_tracking import CostTracker
 
 # Model imports
 from backend.fastapi_app.models.economic_analysis import (
-    CapexInput, OpexInput, EconomicFactors, IndirectFactor,
+    CapexInput, OpexInput, EconomicFactors, Equipment, IndirectFactor,
     ComprehensiveAnalysisInput, BusinessMetricsResponse, ProcessType, UncertaintyConfig
 )
 
 # Service imports
 from .services.profitability_service import ProfitabilityService
 from .utils.error_handling import handle_analysis_error
+from .utils.responses import ORJSONResponse
+from .utils.routing import ORJSONRoute
 
-# Initialize routers
-capex_router = APIRouter(tags=["Capital Expenditure"])
-opex_router = APIRouter(tags=["Operational Expenditure"])
-profitability_router = APIRouter(tags=["Profitability Analysis"])
+# Initialize routers; every endpoint in this module renders JSON with orjson
+capex_router = APIRouter(
+    tags=["Capital Expenditure"], route_class=ORJSONRoute, default_response_class=ORJSONResponse
+)
+opex_router = APIRouter(
+    tags=["Operational Expenditure"], route_class=ORJSONRoute, default_response_class=ORJSONResponse
+)
+profitability_router = APIRouter(
+    tags=["Profitability Analysis"], route_class=ORJSONRoute, default_response_class=ORJSONResponse
+)
 
-# Initialize services
-profitability_service = ProfitabilityService()
+# Initialize services; one cost tracker is shared by every endpoint and the
+# profitability service so tracked analyses accumulate in a single history
+cost_tracker = CostTracker()
+profitability_service = ProfitabilityService(cost_tracker)
 
 #######################
 # Utility Functions
 #######################
 
+# Default indirect cost factors as (name, percentage of equipment cost).
+# Factors built on the server from these are trusted and skip validation via
+# model_construct; factors from the request body are always validated.
+_DEFAULT_INDIRECT_FACTORS = (
+    ("Engineering & Design", 0.15),
+    ("Construction Management", 0.20),
+    ("Contingency", 0.10),  # Standard 10% contingency
+)
+
 def get_default_indirect_factors(equipment_cost: float) -> List[Dict[str, Any]]:
     """Get default indirect factors based on equipment cost"""
     return [
-        {
-            "name": "Engineering & Design",
-            "cost": equipment_cost,
-            "percentage": 0.15
-        },
-        {
-            "name": "Construction Management",
-            "cost": equipment_cost,
-            "percentage": 0.20
-        },
-        {
-            "name": "Contingency",
-            "cost": equipment_cost,
-            "percentage": 0.10  # Standard 10% contingency
-        }
+        {"name": name, "cost": equipment_cost, "percentage": percentage}
+        for name, percentage in _DEFAULT_INDIRECT_FACTORS
     ]
 
+# Validates a whole list of request indirect factors in one pydantic-core call
+_INDIRECT_FACTOR_LIST = TypeAdapter(List[IndirectFactor])
+
+def _validate_indirect_factors(factors: List[Dict[str, Any]]) -> List[IndirectFactor]:
+    """Validate request indirect factors, skipping invalid entries with a warning"""
+    try:
+        return _INDIRECT_FACTOR_LIST.validate_python(factors)
+    except ValidationError:
+        # Rare path: revalidate item by item so valid factors are kept
+        validated = []
+        for factor in factors:
+            try:
+                validated.append(IndirectFactor.model_validate(factor))
+            except ValidationError as e:
+                logger.warning("Invalid indirect factor %s: %s", factor, e)
+        return validated
+
+# Checks a production volume override against the EconomicFactors field constraints
+_PRODUCTION_VOLUME = TypeAdapter(Annotated[float, EconomicFactors.model_fields["production_volume"]])
+
+# Reciprocals for converting months and days to fractions of a year
+_INV_12 = 1.0 / 12.0
+_INV_365 = 1.0 / 365.0
+
+# Fields a utility needs before it is passed on to the OPEX calculation
+_REQUIRED_UTILITY_FIELDS = frozenset(("name", "consumption", "unit_price", "operating_hours", "unit"))
+
+# Idle CAPEX analyzers, reset with clear() on release so an idle analyzer holds
+# no request data. SimpleQueue is thread-safe, so handlers may run on the event
+# loop or in a worker thread.
+_capex_analyzer_pool: "queue.SimpleQueue[CapitalExpenditureAnalysis]" = queue.SimpleQueue()
+
+def acquire_capex_analyzer() -> CapitalExpenditureAnalysis:
+    """Take an idle analyzer from the pool, or create one if none is free"""
+    try:
+        analyzer = _capex_analyzer_pool.get_nowait()
+    except queue.Empty:
+        return CapitalExpenditureAnalysis()
+    return analyzer
+
+def release_capex_analyzer(analyzer: CapitalExpenditureAnalysis) -> None:
+    """Reset an analyzer and return it to the pool for the next request"""
+    analyzer.clear()
+    _capex_analyzer_pool.put_nowait(analyzer)
+
+# Equipment fields passed to the CAPEX analyzer and returned in equipment_breakdown
+_CAPEX_EQUIPMENT_FIELDS = (
+    "name",
+    "base_cost",
+    "efficiency_factor",
+    "installation_complexity",
+    "maintenance_cost",
+    "energy_consumption",
+    "processing_capacity",
+)
+_get_capex_equipment_fields = attrgetter(*_CAPEX_EQUIPMENT_FIELDS)
+
 def validate_indirect_factor(factor: Dict[str, Any]) -> bool:
     """Validate a single indirect factor"""
     try:
@@ -77,35 +146,27 @@ def validate_indirect_factor(factor: Dict[str, Any]) -> bool:
 # CAPEX Endpoints
 #######################
 
-@capex_router.post("/calculate")
-async def calculate_capex(input_data: CapexInput) -> Dict[str, Any]:
-    """Calculate total capital expenditure and its components"""
+def _compute_capex(input_data: CapexInput) -> Dict[str, Any]:
+    """Synchronous CAPEX calculation; runs in a worker thread off the event loop"""
+    capex_analysis = acquire_capex_analyzer()
     try:
-        logger.info(f"Received CAPEX calculation request for process type: {input_data.process_type}")
+        logger.info("Received CAPEX calculation request for process type: %s", input_data.process_type.value)
         
-        # Initialize CAPEX analysis
-        capex_analysis = CapitalExpenditureAnalysis()
-        
-        # Add equipment
+        # Add equipment; only the cost fields are handed to the analyzer, which
+        # echoes them back in the equipment breakdown
         for equipment in input_data.equipment_list:
-            # Add capacity-based cost adjustment and create equipment data
-            equipment_data = {
-                "name": equipment.name,
-                "base_cost": equipment.base_cost,  # Use direct cost input
-                "efficiency_factor": equipment.efficiency_factor,
-                "installation_complexity": equipment.installation_complexity,
-                "maintenance_cost": equipment.maintenance_cost,
-                "energy_consumption": equipment.energy_consumption,
-                "processing_capacity": equipment.processing_capacity
-            }
-            capex_analysis.add_equipment(equipment_data)
+            capex_analysis.add_equipment(
+                dict(zip(_CAPEX_EQUIPMENT_FIELDS, _get_capex_equipment_fields(equipment)))
+            )
             
-        logger.debug(f"Added {len(input_data.equipment_list)} equipment items")
+        logger.debug("Added %d equipment items", len(input_data.equipment_list))
         
-        # Add indirect factors to the analyzer
-        for factor in input_data.indirect_factors:
-            capex_analysis.add_indirect_factor(factor.dict())
-        logger.debug(f"Added {len(input_data.indirect_factors)} indirect factors")
+        # Add indirect factors to the analyzer; the dumped dicts are only read,
+        # so the same list is echoed back in the response
+        indirect_factors = [factor.model_dump() for factor in input_data.indirect_factors]
+        for factor in indirect_factors:
+            capex_analysis.add_indirect_factor(factor)
+        logger.debug("Added %d indirect factors", len(indirect_factors))
         
         # Calculate total CAPEX
         capex_result = capex_analysis.calculate_total_capex(
@@ -128,35 +189,45 @@ async def calculate_capex(input_data: CapexInput) -> Dict[str, Any]:
             "production_volume": input_data.economic_factors.production_volume,
             "indirect_factors": {
                 "source": "input",
-                "factors": [factor.dict() for factor in input_data.indirect_factors]
+                "factors": indirect_factors
             }
         }
 
     except ValueError as ve:
-        logger.error(f"Validation error in CAPEX calculation: {str(ve)}")
+        logger.error("Validation error in CAPEX calculation: %s", ve)
         raise HTTPException(status_code=422, detail=str(ve))
     except Exception as e:
-        logger.error(f"Error in CAPEX calculation: {str(e)}", exc_info=True)
+        logger.error("Error in CAPEX calculation: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        release_capex_analyzer(capex_analysis)
 
-@capex_router.get("/factors")
-async def get_capex_factors() -> EconomicFactors:
+@capex_router.post("/calculate", response_model=None)
+async def calculate_capex(input_data: CapexInput) -> ORJSONResponse:
+    """Calculate total capital expenditure and its components"""
+    return ORJSONResponse(await asyncio.to_thread(_compute_capex, input_data))
+
+# Default CAPEX factors never change, so serialize them once at import
+_CAPEX_FACTORS_JSON = EconomicFactors(
+    project_duration=10,
+    discount_rate=0.1,
+    production_volume=1000.0
+).model_dump_json()
+
+@capex_router.get("/factors", response_model=EconomicFactors)
+async def get_capex_factors() -> Response:
     """Get default economic factors for CAPEX calculations"""
-    return EconomicFactors(
-        project_duration=10,
-        discount_rate=0.1,
-        production_volume=1000.0
-    )
+    return Response(content=_CAPEX_FACTORS_JSON, media_type="application/json")
 
 #######################
 # OPEX Endpoints
 #######################
 
-@opex_router.post("/calculate")
-async def calculate_opex(input_data: OpexInput) -> Dict[str, Any]:
-    """Calculate total operational expenditure and its components"""
+def _compute_opex(input_data: OpexInput) -> Dict[str, Any]:
+    """Synchronous OPEX calculation shared by the OPEX and comprehensive endpoints"""
     try:
-        logger.info(f"Received OPEX calculation request for process type: {input_data.process_type}")
+        logger.info("Received OPEX calculation request for process type: %s", input_data.process_type.value)
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
 
         # Initialize OPEX analysis
         opex_analysis = OperationalExpenditureAnalysis()
@@ -164,12 +235,13 @@ async def calculate_opex(input_data: OpexInput) -> Dict[str, Any]:
 
         # Set production volume first - this is required for scaling calculations
         production_volume = input_data.economic_factors.production_volume
-        logger.debug(f"Setting production volume: {production_volume}")
+        logger.debug("Setting production volume: %s", production_volume)
         opex_analysis.set_production_volume(production_volume)
 
         # Add utilities with operating hours
         for utility in input_data.utilities:
-            logger.debug(f"Processing utility: {utility.name}")
+            if debug_enabled:
+                logger.debug("Processing utility: %s", utility.name)
             utility_data = utility.model_dump()
             # Add operating hours if not present
             if "operating_hours" not in utility_data:
@@ -178,7 +250,8 @@ async def calculate_opex(input_data: OpexInput) -> Dict[str, Any]:
 
         # Add raw materials with protein content handling
         for material in input_data.raw_materials:
-            logger.debug(f"Processing raw material: {material.name}")
+            if debug_enabled:
+                logger.debug("Processing raw material: %s", material.name)
             material_data = material.model_dump()
             # Handle protein content for pea flour
             if material.name.lower() == "pea flour":
@@ -188,9 +261,9 @@ async def calculate_opex(input_data: OpexInput) -> Dict[str, Any]:
                         if 0 <= protein_content <= 1:  # Validate protein content is a valid percentage
                             material_data["protein_content"] = protein_content
                         else:
-                            logger.warning(f"Invalid protein content range for pea flour: {protein_content}")
+                            logger.warning("Invalid protein content range for pea flour: %s", protein_content)
                     except (ValueError, TypeError):
-                        logger.warning(f"Invalid protein content value for pea flour: {material.protein_content}")
+                        logger.warning("Invalid protein content value for pea flour: %s", material.protein_content)
             material_data["protein_content"] = material.protein_content
             opex_analysis.add_raw_material(material_data)
 
@@ -198,7 +271,7 @@ async def calculate_opex(input_data: OpexInput) -> Dict[str, Any]:
         labor_config = input_data.labor_config.model_dump()
         if "benefits_factor" not in labor_config:
             labor_config["benefits_factor"] = 0.35  # Default 35% benefits
-        logger.debug(f"Setting labor data with benefits factor: {labor_config['benefits_factor']}")
+        logger.debug("Setting labor data with benefits factor: %s", labor_config["benefits_factor"])
         opex_analysis.set_labor_data(labor_config)
 
         # Set maintenance factors
@@ -206,7 +279,7 @@ async def calculate_opex(input_data: OpexInput) -> Dict[str, Any]:
             "equipment_cost": input_data.equipment_costs,
             "maintenance_factor": input_data.economic_factors.maintenance_factor
         }
-        logger.debug(f"Setting maintenance factors: {maintenance_data}")
+        logger.debug("Setting maintenance factors: %s", maintenance_data)
         opex_analysis.set_maintenance_factors(maintenance_data)
 
         # Calculate total OPEX with scaling
@@ -231,35 +304,42 @@ async def calculate_opex(input_data: OpexInput) -> Dict[str, Any]:
         }
 
     except EmptyDataError as ede:
-        logger.error(f"Missing required data in OPEX calculation: {str(ede)}")
+        logger.error("Missing required data in OPEX calculation: %s", ede)
         raise HTTPException(
             status_code=422,
             detail={"error": "Missing required data", "message": str(ede)}
         )
     except ValueError as ve:
-        logger.error(f"Validation error in OPEX calculation: {str(ve)}")
+        logger.error("Validation error in OPEX calculation: %s", ve)
         raise HTTPException(
             status_code=422,
             detail={"error": "Validation error", "message": str(ve)}
         )
     except Exception as e:
-        logger.error(f"Error in OPEX calculation: {str(e)}", exc_info=True)
+        logger.error("Error in OPEX calculation: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={"error": "Internal server error", "message": str(e)}
         )
 
-@opex_router.get("/factors")
-async def get_opex_factors() -> EconomicFactors:
+@opex_router.post("/calculate", response_model=None)
+async def calculate_opex(input_data: OpexInput) -> ORJSONResponse:
+    """Calculate total operational expenditure and its components"""
+    return ORJSONResponse(_compute_opex(input_data))
+
+_OPEX_FACTORS_JSON = EconomicFactors(
+    project_duration=10,
+    discount_rate=0.1,
+    production_volume=1000.0,
+    maintenance_factor=0.05,
+    installation_factor=0.2,  # Not used in OPEX but required by model
+    indirect_costs_factor=0.15  # Not used in OPEX but required by model
+).model_dump_json()
+
+@opex_router.get("/factors", response_model=EconomicFactors)
+async def get_opex_factors() -> Response:
     """Get default economic factors for OPEX calculations"""
-    return EconomicFactors(
-        project_duration=10,
-        discount_rate=0.1,
-        production_volume=1000.0,
-        maintenance_factor=0.05,
-        installation_factor=0.2,  # Not used in OPEX but required by model
-        indirect_costs_factor=0.15  # Not used in OPEX but required by model
-    )
+    return Response(content=_OPEX_FACTORS_JSON, media_type="application/json")
 
 #######################
 # Profitability Models
@@ -268,50 +348,74 @@ async def get_opex_factors() -> EconomicFactors:
 class SensitivityAnalysisInput(BaseModel):
     """Input model for sensitivity analysis"""
     base_cash_flows: List[float]
-    variables: List[str] = ["discount_rate", "production_volume", "operating_costs", "revenue"]
-    ranges: Dict[str, tuple] = {
+    variables: List[str] = Field(
+        default_factory=lambda: ["discount_rate", "production_volume", "operating_costs", "revenue"]
+    )
+    ranges: Dict[str, tuple] = Field(default_factory=lambda: {
         "discount_rate": (0.05, 0.15),
         "production_volume": (500.0, 1500.0),
         "operating_costs": (0.8, 1.2),
         "revenue": (0.8, 1.2)
-    }
+    })
     steps: Optional[int] = 10
     fixed_cost_ratio: Optional[float] = None
     variable_cost_ratio: Optional[float] = None
 
 class BusinessMetricsFilter(BaseModel):
     """Filter options for business metrics"""
+    # Frozen so one validated instance can be shared between requests
+    model_config = ConfigDict(frozen=True)
+
     include_margins: bool = True
     include_break_even: bool = True
     include_cost_structure: bool = True
     include_efficiency: bool = True
     include_risk: bool = True
 
+@lru_cache(maxsize=256)
+def _cached_metrics_filter(filter_items: Tuple[Tuple[str, Any], ...]) -> BusinessMetricsFilter:
+    return BusinessMetricsFilter(**dict(filter_items))
+
+def build_metrics_filter(filter_data: Dict[str, Any]) -> BusinessMetricsFilter:
+    """Validate metrics filters, reusing the model built for an identical filter dict"""
+    filter_items = tuple(sorted(filter_data.items()))
+    try:
+        return _cached_metrics_filter(filter_items)
+    except TypeError:
+        # Unhashable values cannot be cached; let validation report them
+        return BusinessMetricsFilter(**filter_data)
+
 #######################
 # Profitability Endpoints
 #######################
 
-async def get_cost_tracker():
-    """Dependency injection for cost tracker"""
-    return CostTracker()
+async def get_cost_tracker() -> CostTracker:
+    """Dependency injection for the shared cost tracker"""
+    return cost_tracker
 
-@profitability_router.post("/analyze")
-async def analyze_profitability(
+async def _run_profitability_analysis(
     input_data: ComprehensiveAnalysisInput,
-    cost_tracker: CostTracker = Depends(get_cost_tracker)
+    cost_tracker: CostTracker,
+    background_tasks: Optional[BackgroundTasks] = None,
+    timestamp: Optional[str] = None
 ) -> Dict[str, Any]:
-    """Perform comprehensive profitability analysis"""
+    """Profitability analysis shared by the profitability and comprehensive endpoints"""
     try:
         result = await profitability_service.analyze_comprehensive(input_data)
         
-        # Track analysis in cost tracker
-        cost_tracker.track_costs({
+        # Track analysis in cost tracker; with background tasks this runs after
+        # the response has been sent
+        tracking_entry = {
             "type": "profitability_analysis",
             "process_type": input_data.process_type,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(),
             "metrics": result["profitability_metrics"],
             "business_insights": result["business_insights"]
-        })
+        }
+        if background_tasks is not None:
+            background_tasks.add_task(cost_tracker.track_costs, tracking_entry)
+        else:
+            cost_tracker.track_costs(tracking_entry)
         
         return {
             "metrics": result["profitability_metrics"],
@@ -321,34 +425,45 @@ async def analyze_profitability(
     except Exception as e:
         return handle_analysis_error(e, "profitability analysis")
 
+@profitability_router.post("/analyze", response_model=None)
+async def analyze_profitability(
+    input_data: ComprehensiveAnalysisInput,
+    background_tasks: BackgroundTasks,
+    cost_tracker: CostTracker = Depends(get_cost_tracker)
+) -> ORJSONResponse:
+    """Perform comprehensive profitability analysis"""
+    return ORJSONResponse(await _run_profitability_analysis(input_data, cost_tracker, background_tasks))
+
 @profitability_router.post("/sensitivity")
 async def analyze_sensitivity(input_data: SensitivityAnalysisInput) -> Dict[str, Any]:
     """Perform sensitivity analysis on economic metrics"""
     try:
-        logger.debug(f"Starting sensitivity analysis with input: {input_data}")
-        logger.debug(f"Base cash flows length: {len(input_data.base_cash_flows)}")
-        logger.debug(f"Variables to analyze: {input_data.variables}")
-        logger.debug(f"Ranges for variables: {input_data.ranges}")
-        logger.debug(f"Number of steps: {input_data.steps}")
+        logger.debug("Starting sensitivity analysis with input: %s", input_data)
+        logger.debug("Base cash flows length: %d", len(input_data.base_cash_flows))
+        logger.debug("Variables to analyze: %s", input_data.variables)
+        logger.debug("Ranges for variables: %s", input_data.ranges)
+        logger.debug("Number of steps: %s", input_data.steps)
         
         result = await profitability_service.analyze_sensitivity(input_data)
-        logger.debug(f"Sensitivity analysis result: {result}")
+        logger.debug("Sensitivity analysis result: %s", result)
         return result
     except Exception as e:
-        logger.error(f"Error in sensitivity analysis: {str(e)}", exc_info=True)
+        logger.error("Error in sensitivity analysis: %s", e, exc_info=True)
         return handle_analysis_error(e, "sensitivity analysis")
 
-@profitability_router.get("/factors")
-async def get_profitability_factors() -> EconomicFactors:
+_PROFITABILITY_FACTORS_JSON = EconomicFactors(
+    project_duration=10,
+    discount_rate=0.1,
+    production_volume=1000.0,
+    installation_factor=0.3,
+    indirect_costs_factor=0.45,
+    maintenance_factor=0.02
+).model_dump_json()
+
+@profitability_router.get("/factors", response_model=EconomicFactors)
+async def get_profitability_factors() -> Response:
     """Get default economic factors for profitability calculations"""
-    return EconomicFactors(
-        project_duration=10,
-        discount_rate=0.1,
-        production_volume=1000.0,
-        installation_factor=0.3,
-        indirect_costs_factor=0.45,
-        maintenance_factor=0.02
-    )
+    return Response(content=_PROFITABILITY_FACTORS_JSON, media_type="application/json")
 
 @profitability_router.get("/business-metrics")
 async def get_business_metrics(
@@ -413,45 +528,46 @@ class UnifiedEconomicInput(BaseModel):
     labor_config: Dict[str, Any]
     revenue_data: Dict[str, Any]
     analysis_config: Dict[str, Any]
-    working_capital: Dict[str, Any] = {"inventory_months": 0, "receivables_days": 0, "payables_days": 0}  # Add with defaults
+    working_capital: Dict[str, Any] = Field(
+        default_factory=lambda: {"inventory_months": 0, "receivables_days": 0, "payables_days": 0}
+    )
 
-@profitability_router.post("/analyze/comprehensive")
+@profitability_router.post("/analyze/comprehensive", response_model=None)
 async def analyze_comprehensive(
     input_data: UnifiedEconomicInput,
+    background_tasks: BackgroundTasks,
     cost_tracker: CostTracker = Depends(get_cost_tracker)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """
     Perform comprehensive economic analysis including CAPEX, OPEX, profitability,
     sensitivity analysis, and business metrics in one request.
     """
     try:
-        logger.info(f"Starting comprehensive analysis for process type: {input_data.process_type}")
+        logger.info("Starting comprehensive analysis for process type: %s", input_data.process_type.value)
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        # One timestamp for the whole analysis, shared with the cost tracker entry
+        timestamp = datetime.now().isoformat()
         
         # Extract Monte Carlo config including random seed
         monte_carlo_config = input_data.analysis_config.get("monte_carlo", {})
         random_seed = monte_carlo_config.get("random_seed", 42)  # Default to 42 if not specified
-        logger.debug(f"Using random seed: {random_seed}")
+        logger.debug("Using random seed: %s", random_seed)
         
-        # Calculate total equipment cost for default indirect factors if needed
-        total_equipment_cost = sum(equip.get("base_cost", 0) for equip in input_data.equipment_list)
+        # Validate the raw equipment dicts once; the models feed both CAPEX and
+        # the equipment cost total used by default indirect factors
+        equipment_models = [Equipment(**equipment) for equipment in input_data.equipment_list]
         
         # Use provided indirect factors or generate defaults
         indirect_factors = []
         if input_data.indirect_factors:
             # Convert dict factors to IndirectFactor models and ensure contingency is included
-            has_contingency = False
-            for factor in input_data.indirect_factors:
-                try:
-                    if factor.get("name", "").lower() == "contingency":
-                        has_contingency = True
-                    indirect_factors.append(IndirectFactor(**factor))
-                except Exception as e:
-                    logger.warning(f"Invalid indirect factor {factor}: {str(e)}")
+            indirect_factors = _validate_indirect_factors(input_data.indirect_factors)
             
-            # Add default contingency if not provided
-            if not has_contingency:
+            # Add default contingency if no valid one was provided
+            if not any(factor.name.lower() == "contingency" for factor in indirect_factors):
+                total_equipment_cost = sum(equipment.base_cost for equipment in equipment_models)
                 contingency_cost = total_equipment_cost * 0.10  # 10% of equipment cost
-                indirect_factors.append(IndirectFactor(
+                indirect_factors.append(IndirectFactor.model_construct(
                     name="Contingency",
                     cost=contingency_cost,  # Add the required cost field
                     percentage=0.10,
@@ -461,48 +577,55 @@ async def analyze_comprehensive(
         
         if not indirect_factors:
             # Use defaults if no valid factors provided
+            total_equipment_cost = sum(equipment.base_cost for equipment in equipment_models)
             default_factors = get_default_indirect_factors(total_equipment_cost)
-            indirect_factors = [IndirectFactor(**factor) for factor in default_factors]
+            indirect_factors = [IndirectFactor.model_construct(**factor) for factor in default_factors]
             logger.info("Using default indirect factors")
         
-        # 1. Prepare CAPEX input
-        capex_input = CapexInput(
-            equipment_list=input_data.equipment_list,
+        # 1. Prepare CAPEX input; every part was validated or built above
+        capex_input = CapexInput.model_construct(
+            equipment_list=equipment_models,
             indirect_factors=indirect_factors,
             economic_factors=input_data.economic_factors,
             process_type=input_data.process_type
         )
         
         # 2. Calculate CAPEX
-        capex_results = await calculate_capex(capex_input)
+        capex_results = _compute_capex(capex_input)
+        capex_summary = capex_results["capex_summary"]
         logger.debug("CAPEX analysis completed")
         
         # 3. Prepare OPEX input
-        economic_factors_dict = input_data.economic_factors.dict()
-        # Update production volume from revenue data if available
-        economic_factors_dict["production_volume"] = input_data.revenue_data.get("annual_production", economic_factors_dict["production_volume"])
+        economic_factors = input_data.economic_factors
+        # Update production volume from revenue data if available; only the
+        # overridden field is validated, the rest of the model is copied as is
+        if "annual_production" in input_data.revenue_data:
+            economic_factors = economic_factors.model_copy(update={
+                "production_volume": _PRODUCTION_VOLUME.validate_python(
+                    input_data.revenue_data["annual_production"]
+                )
+            })
         
-        # Define required fields for utilities
-        required_fields = ["name", "consumption", "unit_price", "operating_hours", "unit"]
-
         # Format utilities with required fields
         formatted_utilities = []
-        for utility in input_data.utilities:
-            utility_data = utility.copy()  # Create a copy to modify
-            logger.debug(f"Processing utility: {utility_data}")
-            # Add operating hours if not present
+        for utility_data in input_data.utilities:
+            if debug_enabled:
+                logger.debug("Processing utility: %s", utility_data)
+            # Add operating hours if not present; copy only when modifying
             if "operating_hours" not in utility_data:
-                utility_data["operating_hours"] = 8000  # Default to 8000 hours per year
-                logger.debug("Added default operating hours")
+                utility_data = {**utility_data, "operating_hours": 8000}  # Default to 8000 hours per year
+                if debug_enabled:
+                    logger.debug("Added default operating hours")
             # Ensure all required fields are present
-            if all(field in utility_data for field in required_fields):
+            missing_fields = _REQUIRED_UTILITY_FIELDS.difference(utility_data)
+            if not missing_fields:
                 formatted_utilities.append(utility_data)
-                logger.debug(f"Added valid utility: {utility_data}")
+                if debug_enabled:
+                    logger.debug("Added valid utility: %s", utility_data)
             else:
-                missing_fields = [field for field in required_fields if field not in utility_data]
-                logger.warning(f"Skipping utility due to missing fields {missing_fields}: {utility_data}")
+                logger.warning("Skipping utility due to missing fields %s: %s", sorted(missing_fields), utility_data)
 
-        logger.debug(f"Final formatted utilities: {formatted_utilities}")
+        logger.debug("Final formatted utilities: %s", formatted_utilities)
 
         if not formatted_utilities:
             raise ValueError("No valid utilities found after validation")
@@ -511,56 +634,62 @@ async def analyze_comprehensive(
             utilities=formatted_utilities,  # Use the formatted utilities list
             raw_materials=input_data.raw_materials,
             labor_config=input_data.labor_config,
-            equipment_costs=capex_results["capex_summary"]["total_capex"],
-            economic_factors=EconomicFactors(**economic_factors_dict),
+            equipment_costs=capex_summary["total_capex"],
+            economic_factors=economic_factors,
             process_type=input_data.process_type
         )
         
         # 4. Calculate OPEX
-        opex_results = await calculate_opex(opex_input)
+        opex_results = _compute_opex(opex_input)
         logger.debug("OPEX analysis completed")
 
         # Calculate working capital components
         annual_opex = opex_results["opex_summary"]["total_opex"]
-        annual_revenue = input_data.revenue_data["product_price"] * input_data.revenue_data["annual_production"] * input_data.revenue_data.get("yield_efficiency", 1.0)
+        revenue_data = input_data.revenue_data
+        annual_revenue = revenue_data["product_price"] * revenue_data["annual_production"] * revenue_data.get("yield_efficiency", 1.0)
+        wc = input_data.working_capital
         
         # Inventory working capital (based on OPEX)
-        inventory_months = input_data.working_capital.get("inventory_months", 2)
-        inventory_wc = annual_opex * (inventory_months / 12)
+        inventory_months = wc.get("inventory_months", 2)
+        inventory_wc = annual_opex * inventory_months * _INV_12
         
         # Accounts receivable (based on revenue)
-        receivables_days = input_data.working_capital.get("receivables_days", 30)
-        receivables_wc = annual_revenue * (receivables_days / 365)
+        receivables_days = wc.get("receivables_days", 30)
+        receivables_wc = annual_revenue * receivables_days * _INV_365
         
         # Accounts payable (based on OPEX)
-        payables_days = input_data.working_capital.get("payables_days", 30)
-        payables_wc = annual_opex * (payables_days / 365)
+        payables_days = wc.get("payables_days", 30)
+        payables_wc = annual_opex * payables_days * _INV_365
         
         # Total working capital
         working_capital = inventory_wc + receivables_wc - payables_wc
-        logger.debug(f"Working capital components:")
-        logger.debug(f"  Inventory ({inventory_months} months): ${inventory_wc:,.2f}")
-        logger.debug(f"  Receivables ({receivables_days} days): ${receivables_wc:,.2f}")
-        logger.debug(f"  Payables ({payables_days} days): ${payables_wc:,.2f}")
-        logger.debug(f"Total working capital: ${working_capital:,.2f}")
+        if debug_enabled:
+            logger.debug("Working capital components:")
+            logger.debug("  Inventory (%s months): $%s", inventory_months, f"{inventory_wc:,.2f}")
+            logger.debug("  Receivables (%s days): $%s", receivables_days, f"{receivables_wc:,.2f}")
+            logger.debug("  Payables (%s days): $%s", payables_days, f"{payables_wc:,.2f}")
+            logger.debug("Total working capital: $%s", f"{working_capital:,.2f}")
 
         # Calculate total investment including working capital
         total_investment = (
-            capex_results["capex_summary"]["total_investment"] +  # Use the CAPEX total investment
+            capex_summary["total_investment"] +  # Use the CAPEX total investment
             working_capital
         )
-        logger.debug(f"Total investment including working capital: {total_investment}")
+        logger.debug("Total investment including working capital: %s", total_investment)
         
         # Calculate updated investment efficiency metrics
-        production_volume = input_data.revenue_data.get("annual_production", 0)
+        production_volume = revenue_data.get("annual_production", 0)
+        investment_per_unit = revenue_to_investment = opex_to_capex = 0.0
         if production_volume > 0:
             investment_per_unit = total_investment / production_volume
             revenue_to_investment = annual_revenue / total_investment if total_investment > 0 else 0.0
-            opex_to_capex = annual_opex / capex_results["capex_summary"]["total_capex"] if capex_results["capex_summary"]["total_capex"] > 0 else 0.0
-            logger.debug(f"Updated investment efficiency metrics:")
-            logger.debug(f"  Investment per Unit: ${investment_per_unit:,.2f}")
-            logger.debug(f"  Revenue to Investment: {revenue_to_investment:.2f}")
-            logger.debug(f"  OPEX to CAPEX: {opex_to_capex:.2f}")
+            total_capex = capex_summary["total_capex"]
+            opex_to_capex = annual_opex / total_capex if total_capex > 0 else 0.0
+            if debug_enabled:
+                logger.debug("Updated investment efficiency metrics:")
+                logger.debug("  Investment per Unit: $%s", f"{investment_per_unit:,.2f}")
+                logger.debug("  Revenue to Investment: %.2f", revenue_to_investment)
+                logger.debug("  OPEX to CAPEX: %.2f", opex_to_capex)
         
         # 5. Prepare profitability input
         profitability_input = ComprehensiveAnalysisInput(
@@ -577,86 +706,89 @@ async def analyze_comprehensive(
         )
         
         # 6. Calculate profitability
-        profitability_results = await analyze_profitability(
+        profitability_results = await _run_profitability_analysis(
             profitability_input,
-            cost_tracker
+            cost_tracker,
+            background_tasks,
+            timestamp=timestamp
         )
         logger.debug("Profitability analysis completed")
-        logger.debug(f"Profitability results: {profitability_results}")
+        logger.debug("Profitability results: %s", profitability_results)
         
         # 7. Prepare and run sensitivity analysis if configured
         sensitivity_results = None
         if "sensitivity" in input_data.analysis_config:
             logger.info("=== Starting Sensitivity Analysis ===")
-            logger.info(f"Sensitivity Config: {input_data.analysis_config['sensitivity']}")
+            logger.info("Sensitivity Config: %s", input_data.analysis_config["sensitivity"])
             
             try:
                 # Calculate fixed and variable costs from OPEX breakdown
-                logger.info("\n=== Detailed Cost Breakdown Analysis ===")
-                
-                # Log OPEX breakdown details
-                logger.info("OPEX Breakdown Details:")
-                logger.info(f"Raw OPEX results: {opex_results}")
-                logger.info(f"Cost breakdown: {opex_results['opex_summary']['cost_breakdown']}")
-                
-                # Calculate and log fixed costs components
-                labor_costs = opex_results["opex_summary"]["cost_breakdown"]["labor"]
-                maintenance_costs = opex_results["opex_summary"]["cost_breakdown"]["maintenance"]
+                cost_breakdown = opex_results["opex_summary"]["cost_breakdown"]
+                labor_costs = cost_breakdown["labor"]
+                maintenance_costs = cost_breakdown["maintenance"]
+                raw_materials = cost_breakdown["raw_materials"]
+                utilities = cost_breakdown["utilities"]
                 fixed_costs = labor_costs + maintenance_costs
-                
-                logger.info("\nFixed Costs Components:")
-                logger.info(f"Labor Costs: ${labor_costs:,.2f}")
-                logger.info(f"Maintenance Costs: ${maintenance_costs:,.2f}")
-                logger.info(f"Total Fixed Costs: ${fixed_costs:,.2f}")
-                
-                # Calculate and log variable costs components
-                raw_materials = opex_results["opex_summary"]["cost_breakdown"]["raw_materials"]
-                utilities = opex_results["opex_summary"]["cost_breakdown"]["utilities"]
                 variable_costs = raw_materials + utilities
                 
-                logger.info("\nVariable Costs Components:")
-                logger.info(f"Raw Materials: ${raw_materials:,.2f}")
-                logger.info(f"Utilities: ${utilities:,.2f}")
-                logger.info(f"Total Variable Costs: ${variable_costs:,.2f}")
-                
                 # Calculate total costs and ratios
                 total_costs = fixed_costs + variable_costs
-                fixed_cost_ratio = fixed_costs / total_costs if total_costs > 0 else 0.0
-                variable_cost_ratio = variable_costs / total_costs if total_costs > 0 else 0.0
-                
-                logger.info("\nCost Structure Summary:")
-                logger.info(f"Total Costs: ${total_costs:,.2f}")
-                logger.info(f"Fixed Cost Ratio: {fixed_cost_ratio:.4f} ({fixed_cost_ratio*100:.2f}%)")
-                logger.info(f"Variable Cost Ratio: {variable_cost_ratio:.4f} ({variable_cost_ratio*100:.2f}%)")
+                inv_total_costs = 1.0 / total_costs if total_costs > 0 else 0.0
+                fixed_cost_ratio = fixed_costs * inv_total_costs
+                variable_cost_ratio = variable_costs * inv_total_costs
                 
-                # Log values being passed to sensitivity analysis
-                logger.info("\nSensitivity Analysis Input:")
-                logger.info(f"Fixed Cost Ratio being passed: {fixed_cost_ratio:.4f}")
-                logger.info(f"Variable Cost Ratio being passed: {variable_cost_ratio:.4f}")
-                logger.info(f"Variables to analyze: {input_data.analysis_config['sensitivity']['variables']}")
-                logger.info(f"Ranges: {input_data.analysis_config['sensitivity']['ranges']}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("\n=== Detailed Cost Breakdown Analysis ===")
+                    logger.info("OPEX Breakdown Details:")
+                    logger.info("Raw OPEX results: %s", opex_results)
+                    logger.info("Cost breakdown: %s", cost_breakdown)
+                    
+                    logger.info("\nFixed Costs Components:")
+                    logger.info("Labor Costs: $%s", f"{labor_costs:,.2f}")
+                    logger.info("Maintenance Costs: $%s", f"{maintenance_costs:,.2f}")
+                    logger.info("Total Fixed Costs: $%s", f"{fixed_costs:,.2f}")
+                    
+                    logger.info("\nVariable Costs Components:")
+                    logger.info("Raw Materials: $%s", f"{raw_materials:,.2f}")
+                    logger.info("Utilities: $%s", f"{utilities:,.2f}")
+                    logger.info("Total Variable Costs: $%s", f"{variable_costs:,.2f}")
+                    
+                    logger.info("\nCost Structure Summary:")
+                    logger.info("Total Costs: $%s", f"{total_costs:,.2f}")
+                    logger.info("Fixed Cost Ratio: %.4f (%.2f%%)", fixed_cost_ratio, fixed_cost_ratio * 100)
+                    logger.info("Variable Cost Ratio: %.4f (%.2f%%)", variable_cost_ratio, variable_cost_ratio * 100)
+                    
+                    # Log values being passed to sensitivity analysis
+                    logger.info("\nSensitivity Analysis Input:")
+                    logger.info("Fixed Cost Ratio being passed: %.4f", fixed_cost_ratio)
+                    logger.info("Variable Cost Ratio being passed: %.4f", variable_cost_ratio)
+                    logger.info("Variables to analyze: %s", input_data.analysis_config["sensitivity"]["variables"])
+                    logger.info("Ranges: %s", input_data.analysis_config["sensitivity"]["ranges"])
                 
+                cash_flows = profitability_results["cash_flows"]
                 sensitivity_input = SensitivityAnalysisInput(
-                    base_cash_flows=profitability_results["cash_flows"],
+                    base_cash_flows=cash_flows,
                     variables=input_data.analysis_config["sensitivity"]["variables"],
                     ranges=input_data.analysis_config["sensitivity"]["ranges"],
                     steps=input_data.analysis_config["sensitivity"]["steps"],
                     fixed_cost_ratio=fixed_cost_ratio,
                     variable_cost_ratio=variable_cost_ratio
                 )
-                logger.info(f"Cash flows for sensitivity: {profitability_results['cash_flows'][:5]}... (first 5 values)")
-                logger.info(f"Number of cash flows: {len(profitability_results['cash_flows'])}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Cash flows for sensitivity: %s... (first 5 values)", cash_flows[:5])
+                    logger.info("Number of cash flows: %d", len(cash_flows))
                 
                 sensitivity_results = await analyze_sensitivity(sensitivity_input)
                 logger.info("=== Sensitivity Analysis Results ===")
-                for var, result in sensitivity_results['sensitivity_analysis'].items():
-                    logger.info(f"Variable: {var}")
-                    logger.info(f"Base NPV: ${result['base_npv']:,.2f}")
-                    logger.info(f"Value range: [{result['range'][0]:,.2f}, {result['range'][-1]:,.2f}]")
-                    logger.info("---")
+                if logger.isEnabledFor(logging.INFO):
+                    for var, result in sensitivity_results['sensitivity_analysis'].items():
+                        logger.info("Variable: %s", var)
+                        logger.info("Base NPV: $%s", f"{result['base_npv']:,.2f}")
+                        logger.info("Value range: [%s, %s]", f"{result['range'][0]:,.2f}", f"{result['range'][-1]:,.2f}")
+                        logger.info("---")
                 logger.info("=== Sensitivity Analysis Completed ===")
             except Exception as e:
-                logger.error(f"Error during sensitivity analysis: {str(e)}", exc_info=True)
+                logger.error("Error during sensitivity analysis: %s", e, exc_info=True)
                 raise
         else:
             logger.info("No sensitivity analysis configured in input_data.analysis_config")
@@ -664,7 +796,7 @@ async def analyze_comprehensive(
         # 8. Get business metrics
         metrics_results = None
         if "metrics_filters" in input_data.analysis_config:
-            filters = BusinessMetricsFilter(**input_data.analysis_config["metrics_filters"])
+            filters = build_metrics_filter(input_data.analysis_config["metrics_filters"])
             metrics_results = await get_business_metrics(
                 filters=filters,
                 cost_tracker=cost_tracker
@@ -674,16 +806,16 @@ async def analyze_comprehensive(
         # 9. Compile comprehensive results
         comprehensive_results = {
             "process_type": input_data.process_type,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
             "capex_analysis": {
                 "capex_summary": {
-                    "total_capex": capex_results["capex_summary"]["total_capex"],
-                    "equipment_costs": capex_results["capex_summary"]["equipment_costs"],
-                    "installation_costs": capex_results["capex_summary"]["installation_costs"],
-                    "indirect_costs": capex_results["capex_summary"]["indirect_costs"],
+                    "total_capex": capex_summary["total_capex"],
+                    "equipment_costs": capex_summary["equipment_costs"],
+                    "installation_costs": capex_summary["installation_costs"],
+                    "indirect_costs": capex_summary["indirect_costs"],
                     "working_capital": working_capital,
                     "total_investment": total_investment,
-                    "base_investment": capex_results["capex_summary"]["total_investment"]  # Original CAPEX investment
+                    "base_investment": capex_summary["total_investment"]  # Original CAPEX investment
                 },
                 "equipment_breakdown": capex_results["equipment_breakdown"],
                 "indirect_factors": capex_results["indirect_factors"],
@@ -702,9 +834,9 @@ async def analyze_comprehensive(
                     }
                 },
                 "investment_efficiency": {
-                    "per_unit": investment_per_unit if 'investment_per_unit' in locals() else 0.0,
-                    "revenue_to_investment": revenue_to_investment if 'revenue_to_investment' in locals() else 0.0,
-                    "opex_to_capex": opex_to_capex if 'opex_to_capex' in locals() else 0.0
+                    "per_unit": investment_per_unit,
+                    "revenue_to_investment": revenue_to_investment,
+                    "opex_to_capex": opex_to_capex
                 }
             },
             "opex_analysis": opex_results,
@@ -716,24 +848,28 @@ async def analyze_comprehensive(
             "sensitivity_analysis": sensitivity_results,
             "business_metrics": metrics_results,
             "financial_model": {
-                "total_capex": capex_results["capex_summary"]["total_capex"],
+                "total_capex": capex_summary["total_capex"],
                 "working_capital": working_capital,
                 "annual_net_cash_flows": profitability_results["cash_flows"][1:]
             }
         }
         
-        if input_data.working_capital.get("inventory_months", 0) > 0:
-            comprehensive_results["financial_model"]["initial_inventory"] = sum(
-                rm["quantity"] * rm["unit_price"] * (input_data.working_capital["inventory_months"] / 12)
-                for rm in input_data.raw_materials
+        if wc.get("inventory_months", 0) > 0:
+            # Quantities and prices from the validated OPEX raw materials, as columns
+            materials = opex_input.raw_materials
+            n_materials = len(materials)
+            quantities = np.fromiter((rm.quantity for rm in materials), dtype=np.float64, count=n_materials)
+            unit_prices = np.fromiter((rm.unit_price for rm in materials), dtype=np.float64, count=n_materials)
+            comprehensive_results["financial_model"]["initial_inventory"] = (
+                float(quantities @ unit_prices) * wc["inventory_months"] * _INV_12
             )
         
-        logger.info(f"Comprehensive analysis completed for process type: {input_data.process_type}")
-        return comprehensive_results
+        logger.info("Comprehensive analysis completed for process type: %s", input_data.process_type.value)
+        return ORJSONResponse(comprehensive_results)
         
     except ValueError as ve:
-        logger.error(f"Validation error in comprehensive analysis: {str(ve)}")
+        logger.error("Validation error in comprehensive analysis: %s", ve)
         raise HTTPException(status_code=422, detail=str(ve))
     except Exception as e:
-        logger.error(f"Error in comprehensive analysis: {str(e)}", exc_info=True)
+        logger.error("Error in comprehensive analysis: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
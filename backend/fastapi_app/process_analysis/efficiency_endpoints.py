@@ -1,45 +1,65 @@
-from fastapi import APIRouter, HTTPException, Response
-from typing import Dict, Optional, List, Any
-from pydantic import BaseModel, Field, field_validator
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from typing import Dict, Optional, List, Any, Literal, Mapping, Tuple
+from pydantic import BaseModel, ConfigDict, Field, NonNegativeFloat, TypeAdapter, ValidationError, field_validator
+import hashlib
 import logging
+from dataclasses import dataclass
+from collections import OrderedDict
 import math
 import json
+from types import MappingProxyType
+
+import numpy as np
+import orjson
 
 from analytics.environmental.services.efficiency_calculator import EfficiencyCalculator
 from .services.rust_handler import RustHandler
+from .utils.responses import ORJSONResponse
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-router = APIRouter(tags=["eco-efficiency"])
+# Every endpoint in this module renders JSON with orjson
+router = APIRouter(tags=["eco-efficiency"], default_response_class=ORJSONResponse)
 
 class EconomicMetrics(BaseModel):
-    capex: Dict[str, float] = Field(..., description="Capital expenditure breakdown including equipment_cost, installation_cost, indirect_cost, total_capex")
-    opex: Dict[str, float] = Field(..., description="Operational expenditure breakdown including utilities_cost, materials_cost, labor_cost, maintenance_cost, total_opex")
-    production_volume: float = Field(..., description="Total annual production capacity in kg/year")
-    product_prices: Dict[str, float] = Field(..., description="Product prices by stream type (main_product, waste_product) in USD/kg")
-    production_volumes: Dict[str, float] = Field(..., description="Production volumes by stream type (main_product, waste_product) in kg/year")
-    raw_material_cost: float = Field(..., description="Raw material cost in USD/kg")
+    model_config = ConfigDict(frozen=True, allow_inf_nan=False)
+
+    capex: Dict[str, NonNegativeFloat] = Field(..., description="Capital expenditure breakdown including equipment_cost, installation_cost, indirect_cost, total_capex")
+    opex: Dict[str, NonNegativeFloat] = Field(..., description="Operational expenditure breakdown including utilities_cost, materials_cost, labor_cost, maintenance_cost, total_opex")
+    production_volume: float = Field(..., ge=0, description="Total annual production capacity in kg/year")
+    product_prices: Dict[str, NonNegativeFloat] = Field(..., description="Product prices by stream type (main_product, waste_product) in USD/kg")
+    production_volumes: Dict[str, NonNegativeFloat] = Field(..., description="Production volumes by stream type (main_product, waste_product) in kg/year")
+    raw_material_cost: float = Field(..., ge=0, description="Raw material cost in USD/kg")
 
 class QualityMetrics(BaseModel):
-    protein_recovery: float = Field(..., description="Protein recovery rate in %")
-    separation_efficiency: float = Field(..., description="Overall separation efficiency in %")
-    process_efficiency: float = Field(..., description="Process efficiency metric in %")
-    particle_size_distribution: Dict[str, float] = Field(..., description="Particle size distribution metrics (D10, D50, D90)")
+    model_config = ConfigDict(frozen=True, allow_inf_nan=False)
+
+    protein_recovery: float = Field(..., ge=0, description="Protein recovery rate in %")
+    separation_efficiency: float = Field(..., ge=0, description="Overall separation efficiency in %")
+    process_efficiency: float = Field(..., ge=0, description="Process efficiency metric in %")
+    particle_size_distribution: Dict[str, NonNegativeFloat] = Field(..., description="Particle size distribution metrics (D10, D50, D90)")
 
 class EnvironmentalImpacts(BaseModel):
-    gwp: float = Field(..., description="Global Warming Potential in CO2eq")
-    hct: float = Field(..., description="Human Carcinogenic Toxicity in CTUh")
-    frs: float = Field(..., description="Fossil Resource Scarcity in kg oil eq")
-    water_consumption: float = Field(..., description="Water consumption impact in m3")
+    model_config = ConfigDict(frozen=True, allow_inf_nan=False)
+
+    gwp: float = Field(..., ge=0, description="Global Warming Potential in CO2eq")
+    hct: float = Field(..., ge=0, description="Human Carcinogenic Toxicity in CTUh")
+    frs: float = Field(..., ge=0, description="Fossil Resource Scarcity in kg oil eq")
+    water_consumption: float = Field(..., ge=0, description="Water consumption impact in m3")
     allocated_impacts: Dict[str, Any] = Field(..., description="Allocated environmental impacts with method, factors, and results")
 
 class ResourceInputs(BaseModel):
-    energy_consumption: float = Field(..., description="Total energy consumption in kWh")
-    water_usage: float = Field(..., description="Total water usage in m3")
-    raw_material_input: float = Field(..., description="Raw material input in kg")
+    model_config = ConfigDict(frozen=True, allow_inf_nan=False)
+
+    energy_consumption: float = Field(..., ge=0, description="Total energy consumption in kWh")
+    water_usage: float = Field(..., ge=0, description="Total water usage in m3")
+    raw_material_input: float = Field(..., ge=0, description="Raw material input in kg")
 
 class EcoEfficiencyRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     economic_data: EconomicMetrics
     quality_metrics: QualityMetrics
     environmental_impacts: EnvironmentalImpacts
@@ -54,97 +74,202 @@ class EcoEfficiencyRequest(BaseModel):
             raise ValueError(f"Process type must be one of {valid_types}")
         return v.lower()
 
-    @field_validator('*')
+@dataclass(frozen=True)
+class EfficiencyInputs:
+    """Fixed-order float64 columns of the request values read by the Rust kernels"""
+    economic: np.ndarray       # total_capex, total_annual_cost
+    environmental: np.ndarray  # gwp, hct, frs, water_consumption
+
     @classmethod
-    def validate_non_negative(cls, v: Any, field: Field) -> Any:
-        if isinstance(v, (int, float)):
-            if v < 0:
-                raise ValueError(f"{field.name} cannot be negative")
-        return v
+    def from_request(cls, request: EcoEfficiencyRequest) -> "EfficiencyInputs":
+        economic_data = request.economic_data
+        impacts = request.environmental_impacts
+        return cls(
+            economic=np.array([
+                economic_data.capex.get('total_capex', 0.0),
+                economic_data.opex.get('total_annual_cost', 0.0)
+            ]),
+            environmental=np.array([impacts.gwp, impacts.hct, impacts.frs, impacts.water_consumption])
+        )
+
+# Per-request efficiency scores; orjson serializes these as JSON objects directly
+@dataclass(frozen=True)
+class EconomicEfficiency:
+    __slots__ = ("cost_efficiency", "revenue_efficiency")
+
+    cost_efficiency: float
+    revenue_efficiency: float
+
+@dataclass(frozen=True)
+class EnvironmentalEfficiency:
+    __slots__ = ("carbon_efficiency", "water_efficiency", "resource_efficiency")
+
+    carbon_efficiency: float
+    water_efficiency: float
+    resource_efficiency: float
+
+@dataclass(frozen=True)
+class TechnicalEfficiency:
+    __slots__ = ("protein_recovery_efficiency", "separation_efficiency", "process_efficiency")
+
+    protein_recovery_efficiency: float
+    separation_efficiency: float
+    process_efficiency: float
 
 # Initialize services
 efficiency_calculator = EfficiencyCalculator()
 rust_handler = RustHandler()
 logger.info("Initialized Eco-efficiency services")
 
-@router.post("/calculate")
-async def calculate_eco_efficiency(request: EcoEfficiencyRequest):
-    """Calculate comprehensive eco-efficiency metrics using both Python and Rust implementations"""
+def _compute_eco_efficiency(request: EcoEfficiencyRequest) -> Tuple[Dict[str, Any], bool]:
+    """Compute the /calculate response for a validated request and whether the Rust results are in it"""
+    # Read the validated sub-models directly; their fields are already floats
+    economic_data = request.economic_data
+    impacts = request.environmental_impacts
+    quality = request.quality_metrics
+    inputs = EfficiencyInputs.from_request(request)
+    total_capex, total_opex = inputs.economic.tolist()
+    
+    # Calculate efficiency metrics
+    economic = calculate_economic_efficiency(
+        capex=total_capex,
+        opex=total_opex,
+        production_volume=economic_data.production_volume,
+        product_price=economic_data.product_prices.get('main_product', 0.0)
+    )
+    environmental = calculate_environmental_efficiency(
+        gwp=impacts.gwp,
+        hct=impacts.hct,
+        frs=impacts.frs,
+        water=impacts.water_consumption,
+        production_volume=economic_data.production_volume
+    )
+    technical = calculate_technical_efficiency(
+        protein_recovery=quality.protein_recovery,
+        separation_efficiency=quality.separation_efficiency,
+        process_efficiency=quality.process_efficiency
+    )
+    efficiency_metrics = {
+        "economic_efficiency": economic,
+        "environmental_efficiency": environmental,
+        "technical_efficiency": technical
+    }
+    
+    # Use Rust for performance-critical calculations
     try:
-        logger.debug(f"Received eco-efficiency calculation request for process: {request.process_type}")
+        # Calculate eco-efficiency matrix using Rust; the float64 columns
+        # are passed through without conversion
+        efficiency_matrix, average_efficiency = rust_handler.calculate_eco_efficiency_summary(
+            economic_values=inputs.economic,
+            environmental_impacts=inputs.environmental
+        )
         
-        # Calculate efficiency metrics
-        efficiency_metrics = {
-            "economic_efficiency": calculate_economic_efficiency(
-                capex=float(request.economic_data.capex.get('total_capex', 0.0)),
-                opex=float(request.economic_data.opex.get('total_annual_cost', 0.0)),
-                production_volume=float(request.economic_data.production_volume),
-                product_price=float(request.economic_data.product_prices.get('main_product', 0.0))
-            ),
-            "environmental_efficiency": calculate_environmental_efficiency(
-                gwp=float(request.environmental_impacts.gwp),
-                hct=float(request.environmental_impacts.hct),
-                frs=float(request.environmental_impacts.frs),
-                water=float(request.environmental_impacts.water_consumption),
-                production_volume=float(request.economic_data.production_volume)
-            ),
-            "technical_efficiency": calculate_technical_efficiency(
-                protein_recovery=float(request.quality_metrics.protein_recovery),
-                separation_efficiency=float(request.quality_metrics.separation_efficiency),
-                process_efficiency=float(request.quality_metrics.process_efficiency)
-            )
-        }
+        logger.debug(f"Rust efficiency matrix calculation successful: {efficiency_matrix}")
         
-        # Use Rust for performance-critical calculations
-        try:
-            # Calculate eco-efficiency matrix using Rust
-            economic_values = [
-                request.economic_data.capex.get('total_capex', 0.0),
-                request.economic_data.opex.get('total_annual_cost', 0.0)
-            ]
-            environmental_impacts = [
-                request.environmental_impacts.gwp,
-                request.environmental_impacts.hct,
-                request.environmental_impacts.frs,
-                request.environmental_impacts.water_consumption
-            ]
-            
-            efficiency_matrix = rust_handler.calculate_eco_efficiency_matrix(
-                economic_values=economic_values,
-                environmental_impacts=environmental_impacts
+    except Exception as e:
+        logger.error(f"Rust calculation failed, falling back to Python: {str(e)}")
+        efficiency_matrix = None
+    
+    # Combine results; the index is shared with the relative performance
+    eco_efficiency_index = _request_eco_efficiency_index(economic, environmental, technical)
+    response_data = {
+        "status": "success",
+        "process_type": request.process_type,
+        "efficiency_metrics": efficiency_metrics,
+        "performance_indicators": {
+            "eco_efficiency_index": eco_efficiency_index,
+            "relative_performance": calculate_relative_performance(
+                efficiency_metrics, request.process_type, eco_efficiency_index
             )
-            
-            logger.debug(f"Rust efficiency matrix calculation successful: {efficiency_matrix}")
-            
-        except Exception as e:
-            logger.error(f"Rust calculation failed, falling back to Python: {str(e)}")
-            efficiency_matrix = None
-        
-        # Combine results
-        response_data = {
-            "status": "success",
-            "process_type": request.process_type,
-            "efficiency_metrics": efficiency_metrics,
-            "performance_indicators": {
-                "eco_efficiency_index": calculate_eco_efficiency_index(
-                    efficiency_metrics, request.process_type
-                ),
-                "relative_performance": calculate_relative_performance(
-                    efficiency_metrics, request.process_type
-                )
-            }
         }
-        
-        # Add Rust calculations if available
-        if efficiency_matrix:
-            response_data["rust_calculations"] = {
-                "efficiency_matrix": efficiency_matrix,
-                "matrix_indicators": interpret_efficiency_matrix(efficiency_matrix)
-            }
-        
-        logger.info("Eco-efficiency calculation completed successfully")
-        return response_data
-        
+    }
+    
+    # Add Rust calculations if available
+    if efficiency_matrix:
+        response_data["rust_calculations"] = {
+            "efficiency_matrix": efficiency_matrix,
+            "matrix_indicators": interpret_efficiency_matrix(efficiency_matrix, average_efficiency)
+        }
+    
+    return response_data, "rust_calculations" in response_data
+
+class _ResponseCache:
+    """Bounded LRU of rendered responses keyed by a SHA-256 digest of the request body"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, bytes]" = OrderedDict()
+
+    @staticmethod
+    def key(raw_body: bytes) -> bytes:
+        return hashlib.sha256(raw_body).digest()
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def put(self, key: bytes, body: bytes) -> None:
+        self._entries[key] = body
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+# /calculate is deterministic in its inputs, so rendered responses for repeated
+# scenarios are kept. Only complete results are stored: a response from the
+# Rust fallback path is recomputed next time in case the failure was transient.
+_ECO_EFFICIENCY_RESPONSES = _ResponseCache(maxsize=512)
+
+def _eco_efficiency_body(raw_body: bytes) -> bytes:
+    """Rendered /calculate response for a raw request body, served from the cache when possible"""
+    key = _ResponseCache.key(raw_body)
+    body = _ECO_EFFICIENCY_RESPONSES.get(key)
+    if body is None:
+        response_data, complete = _compute_eco_efficiency(_ECO_EFFICIENCY_ADAPTER.validate_json(raw_body))
+        body = orjson.dumps(response_data)
+        if complete:
+            _ECO_EFFICIENCY_RESPONSES.put(key, body)
+    return body
+
+def _inline_schema(model: type) -> Dict[str, Any]:
+    """JSON schema of a model with its $defs inlined, for use in openapi_extra"""
+    schema = model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+
+    def resolve(node: Any) -> Any:
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(definitions[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+
+    return resolve(schema)
+
+# The body is validated from raw bytes in pydantic-core, so the route declares
+# its request schema for the OpenAPI docs by hand
+_ECO_EFFICIENCY_ADAPTER = TypeAdapter(EcoEfficiencyRequest)
+_ECO_EFFICIENCY_BODY = {
+    "requestBody": {
+        "content": {"application/json": {"schema": _inline_schema(EcoEfficiencyRequest)}},
+        "required": True
+    }
+}
+
+@router.post("/calculate", response_model=None, openapi_extra=_ECO_EFFICIENCY_BODY)
+async def calculate_eco_efficiency(request: Request) -> Response:
+    """Calculate comprehensive eco-efficiency metrics using both Python and Rust implementations"""
+    try:
+        body = _eco_efficiency_body(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
         raise HTTPException(status_code=422, detail=str(e))
@@ -152,126 +277,196 @@ async def calculate_eco_efficiency(request: EcoEfficiencyRequest):
         error_msg = f"Error in eco-efficiency calculation: {str(e)}"
         logger.error(error_msg, exc_info=True)
         raise HTTPException(status_code=500, detail=error_msg)
+    
+    logger.info("Eco-efficiency calculation completed successfully")
+    return Response(content=body, media_type="application/json")
 
 @router.get("/indicators")
-async def get_efficiency_indicators():
+async def get_efficiency_indicators() -> Response:
     """Get available eco-efficiency indicators and their descriptions"""
-    return {
-        "economic_based": {
-            "npv_efficiency": "NPV per environmental impact",
-            "profit_efficiency": "Net profit per environmental impact",
-            "cost_efficiency": "Production cost per environmental impact"
-        },
-        "quality_based": {
-            "purity_efficiency": "Product purity per environmental impact",
-            "yield_efficiency": "Product yield per environmental impact",
-            "protein_efficiency": "Protein recovery per environmental impact"
-        },
-        "resource_based": {
-            "energy_efficiency": "Product output per energy input",
-            "water_efficiency": "Product output per water consumption",
-            "material_efficiency": "Product output per raw material input"
-        },
-        "process_specific": {
-            "baseline_reference": "Reference process eco-efficiency",
-            "rf_improvement": "RF process relative improvement",
-            "ir_improvement": "IR process relative improvement"
-        }
-    }
+    return Response(content=_INDICATORS_BODY, media_type="application/json")
 
 @router.get("/reference-values/{process_type}")
-async def get_reference_values(process_type: str):
+async def get_reference_values(
+    process_type: Literal['baseline', 'RF', 'IR'],
+    if_none_match: Optional[str] = Header(None)
+) -> Response:
     """Get reference values for eco-efficiency calculations by process type"""
-    try:
-        if process_type not in ['baseline', 'RF', 'IR']:
-            raise HTTPException(
-                status_code=422,
-                detail="Invalid process type. Must be one of: baseline, RF, IR"
-            )
-            
-        return {
-            "economic_reference": get_economic_reference(process_type),
-            "environmental_reference": get_environmental_reference(process_type),
-            "quality_reference": get_quality_reference(process_type)
-        }
-        
-    except Exception as e:
-        error_msg = f"Error retrieving reference values: {str(e)}"
-        logger.error(error_msg, exc_info=True)
-        raise HTTPException(status_code=500, detail=error_msg)
+    body, etag = _REFERENCE_RESPONSES[process_type]
+    headers = {"Cache-Control": _REFERENCE_CACHE_CONTROL, "ETag": etag}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 # Helper functions
-def calculate_eco_efficiency_index(metrics: Dict, process_type: str) -> float:
-    """Calculate overall eco-efficiency index"""
-    weights = {
-        'economic': 0.4,
-        'environmental': 0.4,
-        'quality': 0.2
-    }
-    
-    economic_score = sum(metrics["economic_efficiency"].values()) / len(metrics["economic_efficiency"])
-    quality_score = sum(metrics["technical_efficiency"].values()) / len(metrics["technical_efficiency"])
-    efficiency_score = sum(metrics["environmental_efficiency"].values()) / len(metrics["environmental_efficiency"])
-    
+# Metric groups and their index weights: economic, environmental, quality
+_INDEX_WEIGHTS = (
+    ("economic_efficiency", 0.4),
+    ("environmental_efficiency", 0.4),
+    ("technical_efficiency", 0.2),
+)
+
+# Weights for the unrolled request index, read from the table so they cannot drift
+_ECONOMIC_WEIGHT = dict(_INDEX_WEIGHTS)["economic_efficiency"]
+_ENVIRONMENTAL_WEIGHT = dict(_INDEX_WEIGHTS)["environmental_efficiency"]
+_TECHNICAL_WEIGHT = dict(_INDEX_WEIGHTS)["technical_efficiency"]
+
+def _request_eco_efficiency_index(
+    economic: EconomicEfficiency,
+    environmental: EnvironmentalEfficiency,
+    technical: TechnicalEfficiency
+) -> float:
+    """calculate_eco_efficiency_index unrolled over the score dataclass fields"""
     return (
-        weights['economic'] * economic_score +
-        weights['environmental'] * efficiency_score +
-        weights['quality'] * quality_score
+        _ECONOMIC_WEIGHT * (economic.cost_efficiency + economic.revenue_efficiency) * 0.5
+        + _ENVIRONMENTAL_WEIGHT * (
+            environmental.carbon_efficiency
+            + environmental.water_efficiency
+            + environmental.resource_efficiency
+        ) / 3
+        + _TECHNICAL_WEIGHT * (
+            technical.protein_recovery_efficiency
+            + technical.separation_efficiency
+            + technical.process_efficiency
+        ) / 3
     )
 
-def calculate_relative_performance(metrics: Dict, process_type: str) -> Dict[str, float]:
-    """Calculate relative performance compared to baseline"""
+def calculate_eco_efficiency_index(metrics: Dict, process_type: str) -> float:
+    """Calculate overall eco-efficiency index"""
+    economic = metrics["economic_efficiency"]
+    if isinstance(economic, EconomicEfficiency):
+        # Per-request score dataclasses
+        return _request_eco_efficiency_index(
+            economic, metrics["environmental_efficiency"], metrics["technical_efficiency"]
+        )
+    # Reference tables, whose keys differ from the score fields
+    index = 0.0
+    for group, weight in _INDEX_WEIGHTS:
+        scores = metrics[group]
+        index += weight * math.fsum(scores.values()) / len(scores)
+    return index
+
+def calculate_relative_performance(
+    metrics: Dict, process_type: str, current_index: Optional[float] = None
+) -> Dict[str, float]:
+    """Calculate relative performance compared to baseline, reusing current_index if given"""
     if process_type == 'baseline':
         return {"relative_improvement": 1.0}
     
-    baseline_reference = get_reference_values('baseline')
-    current_index = calculate_eco_efficiency_index(metrics, process_type)
-    baseline_index = calculate_eco_efficiency_index(baseline_reference, 'baseline')
+    if current_index is None:
+        current_index = calculate_eco_efficiency_index(metrics, process_type)
     
     return {
-        "relative_improvement": current_index / baseline_index if baseline_index > 0 else 0
+        "relative_improvement": current_index / _BASELINE_INDEX if _BASELINE_INDEX > 0 else 0
     }
 
-def interpret_efficiency_matrix(matrix: List[float]) -> Dict[str, float]:
-    """Interpret the Rust-calculated efficiency matrix"""
+def interpret_efficiency_matrix(matrix: List[float], average_efficiency: float) -> Dict[str, float]:
+    """Interpret the Rust-calculated efficiency matrix and its Rust-computed mean"""
     return {
         "npv_efficiency": matrix[0],
         "profit_efficiency": matrix[1],
-        "average_efficiency": sum(matrix) / len(matrix)
+        "average_efficiency": average_efficiency
     }
 
+def _frozen(table: Dict[str, Dict[str, Any]]) -> Mapping[str, Mapping[str, Any]]:
+    """Read-only view of a nested constant table, shared safely across requests"""
+    return MappingProxyType({key: MappingProxyType(values) for key, values in table.items()})
+
+# Available indicators, served from bytes serialized once at import
+_EFFICIENCY_INDICATORS = _frozen({
+    "economic_based": {
+        "npv_efficiency": "NPV per environmental impact",
+        "profit_efficiency": "Net profit per environmental impact",
+        "cost_efficiency": "Production cost per environmental impact"
+    },
+    "quality_based": {
+        "purity_efficiency": "Product purity per environmental impact",
+        "yield_efficiency": "Product yield per environmental impact",
+        "protein_efficiency": "Protein recovery per environmental impact"
+    },
+    "resource_based": {
+        "energy_efficiency": "Product output per energy input",
+        "water_efficiency": "Product output per water consumption",
+        "material_efficiency": "Product output per raw material input"
+    },
+    "process_specific": {
+        "baseline_reference": "Reference process eco-efficiency",
+        "rf_improvement": "RF process relative improvement",
+        "ir_improvement": "IR process relative improvement"
+    }
+})
+
+# Reference values by process type
+_ECONOMIC_REFERENCES = _frozen({
+    'baseline': {'npv': 1000000, 'roi': 20},
+    'RF': {'npv': 1200000, 'roi': 24},
+    'IR': {'npv': 1100000, 'roi': 22}
+})
+
+_ENVIRONMENTAL_REFERENCES = _frozen({
+    'baseline': {'gwp': 100, 'water': 1000},
+    'RF': {'gwp': 90, 'water': 900},
+    'IR': {'gwp': 95, 'water': 950}
+})
+
+_QUALITY_REFERENCES = _frozen({
+    'baseline': {'protein_recovery': 0.75, 'separation_efficiency': 0.85},
+    'RF': {'protein_recovery': 0.80, 'separation_efficiency': 0.90},
+    'IR': {'protein_recovery': 0.78, 'separation_efficiency': 0.88}
+})
+
+def _thaw(table: Mapping[str, Mapping[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Plain-dict copy of a frozen table for serialization"""
+    return {key: dict(values) for key, values in table.items()}
+
+_INDICATORS_BODY = orjson.dumps(_thaw(_EFFICIENCY_INDICATORS))
+
 # Reference value functions
-def get_economic_reference(process_type: str) -> Dict[str, float]:
+def get_economic_reference(process_type: str) -> Mapping[str, float]:
     """Get economic reference values for process type"""
-    references = {
-        'baseline': {'npv': 1000000, 'roi': 20},
-        'RF': {'npv': 1200000, 'roi': 24},
-        'IR': {'npv': 1100000, 'roi': 22}
-    }
-    return references[process_type]
+    return _ECONOMIC_REFERENCES[process_type]
 
-def get_environmental_reference(process_type: str) -> Dict[str, float]:
+def get_environmental_reference(process_type: str) -> Mapping[str, float]:
     """Get environmental reference values for process type"""
-    references = {
-        'baseline': {'gwp': 100, 'water': 1000},
-        'RF': {'gwp': 90, 'water': 900},
-        'IR': {'gwp': 95, 'water': 950}
-    }
-    return references[process_type]
+    return _ENVIRONMENTAL_REFERENCES[process_type]
 
-def get_quality_reference(process_type: str) -> Dict[str, float]:
+def get_quality_reference(process_type: str) -> Mapping[str, float]:
     """Get quality reference values for process type"""
-    references = {
-        'baseline': {'protein_recovery': 0.75, 'separation_efficiency': 0.85},
-        'RF': {'protein_recovery': 0.80, 'separation_efficiency': 0.90},
-        'IR': {'protein_recovery': 0.78, 'separation_efficiency': 0.88}
+    return _QUALITY_REFERENCES[process_type]
+
+def _assemble_reference(process_type: str) -> Dict[str, Mapping[str, float]]:
+    """Arrange reference values in the metrics shape used by calculate_eco_efficiency_index"""
+    return {
+        "economic_efficiency": get_economic_reference(process_type),
+        "environmental_efficiency": get_environmental_reference(process_type),
+        "technical_efficiency": get_quality_reference(process_type)
     }
-    return references[process_type]
 
-def calculate_economic_efficiency(capex: float, opex: float, production_volume: float, product_price: float) -> Dict[str, float]:
+# Reference responses are fixed per process type: serialize each once and let
+# clients cache it, revalidating with the ETag
+_REFERENCE_CACHE_CONTROL = "public, max-age=3600"
+
+def _build_reference_response(process_type: str) -> Tuple[bytes, str]:
+    """Serialize one process type's reference values and derive their ETag"""
+    body = orjson.dumps({
+        "economic_reference": dict(get_economic_reference(process_type)),
+        "environmental_reference": dict(get_environmental_reference(process_type)),
+        "quality_reference": dict(get_quality_reference(process_type))
+    })
+    return body, f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+_REFERENCE_RESPONSES = {
+    process_type: _build_reference_response(process_type)
+    for process_type in _ECONOMIC_REFERENCES
+}
+
+# The baseline reference never changes, so its index is computed once at import
+_BASELINE_INDEX = calculate_eco_efficiency_index(_assemble_reference('baseline'), 'baseline')
+
+def calculate_economic_efficiency(capex: float, opex: float, production_volume: float, product_price: float) -> EconomicEfficiency:
     """Calculate economic efficiency metrics"""
     if production_volume <= 0:
-        return {"cost_efficiency": 0.0, "revenue_efficiency": 0.0}
+        return EconomicEfficiency(cost_efficiency=0.0, revenue_efficiency=0.0)
         
     # Calculate cost per unit of production
     total_cost = capex + opex
@@ -282,45 +477,41 @@ def calculate_economic_efficiency(capex: float, opex: float, production_volume:
     revenue = production_volume * product_price
     revenue_efficiency = revenue / total_cost if total_cost > 0 else 0.0
     
-    return {
-        "cost_efficiency": cost_efficiency,
-        "revenue_efficiency": min(1.0, revenue_efficiency)  # Cap at 1.0
-    }
+    return EconomicEfficiency(
+        cost_efficiency=cost_efficiency,
+        revenue_efficiency=min(1.0, revenue_efficiency)  # Cap at 1.0
+    )
 
-def calculate_environmental_efficiency(gwp: float, hct: float, frs: float, water: float, production_volume: float) -> Dict[str, float]:
+def calculate_environmental_efficiency(gwp: float, hct: float, frs: float, water: float, production_volume: float) -> EnvironmentalEfficiency:
     """Calculate environmental efficiency metrics"""
     if production_volume <= 0:
-        return {
-            "carbon_efficiency": 0.0,
-            "water_efficiency": 0.0,
-            "resource_efficiency": 0.0
-        }
+        return EnvironmentalEfficiency(
+            carbon_efficiency=0.0,
+            water_efficiency=0.0,
+            resource_efficiency=0.0
+        )
     
-    # Calculate per unit impacts
-    carbon_per_unit = gwp / production_volume
-    water_per_unit = water / production_volume
-    resource_impact = (hct + frs) / production_volume
+    # Efficiency score 1 / (1 + impact per unit), written as volume / (volume + impact)
+    # so each score costs one division (lower impact = higher efficiency)
+    carbon_efficiency = production_volume / (production_volume + gwp)
+    water_efficiency = production_volume / (production_volume + water)
+    resource_efficiency = production_volume / (production_volume + (hct + frs))
     
-    # Convert to efficiency scores (lower impact = higher efficiency)
-    carbon_efficiency = 1.0 / (1.0 + carbon_per_unit)
-    water_efficiency = 1.0 / (1.0 + water_per_unit)
-    resource_efficiency = 1.0 / (1.0 + resource_impact)
-    
-    return {
-        "carbon_efficiency": carbon_efficiency,
-        "water_efficiency": water_efficiency,
-        "resource_efficiency": resource_efficiency
-    }
+    return EnvironmentalEfficiency(
+        carbon_efficiency=carbon_efficiency,
+        water_efficiency=water_efficiency,
+        resource_efficiency=resource_efficiency
+    )
 
-def calculate_technical_efficiency(protein_recovery: float, separation_efficiency: float, process_efficiency: float) -> Dict[str, float]:
+def calculate_technical_efficiency(protein_recovery: float, separation_efficiency: float, process_efficiency: float) -> TechnicalEfficiency:
     """Calculate technical efficiency metrics"""
     # Normalize all values to 0-1 range
     protein_score = protein_recovery / 100.0 if protein_recovery <= 100.0 else 1.0
     separation_score = separation_efficiency / 100.0 if separation_efficiency <= 100.0 else 1.0
     process_score = process_efficiency / 100.0 if process_efficiency <= 100.0 else 1.0
     
-    return {
-        "protein_recovery_efficiency": protein_score,
-        "separation_efficiency": separation_score,
-        "process_efficiency": process_score
-    } 
\ No newline at end of file
+    return TechnicalEfficiency(
+        protein_recovery_efficiency=protein_score,
+        separation_efficiency=separation_score,
+        process_efficiency=process_score
+    ) 
\ No newline at end of file
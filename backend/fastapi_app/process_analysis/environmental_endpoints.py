@@ -1,18 +1,25 @@
 from fastapi import APIRouter, HTTPException, Response, Header, Query, Request, Body
-from typing import Dict, Optional, Any
+from fastapi.responses import JSONResponse
+from typing import Dict, Optional, Any, Tuple
+import copy
 import logging
 import json
+import os
 import traceback
+from dataclasses import asdict
 from datetime import datetime
+from functools import lru_cache
 from pydantic import BaseModel
 
 from analytics.environmental.services.impact_calculator import ImpactCalculator
 from backend.fastapi_app.models.environmental_analysis import (
     AllocationMethod,
     ProcessInputs,
+    ProcessInputsData,
     AllocationRequest,
     ProcessAnalysisResponse,
-    AllocationWeights
+    AllocationWeights,
+    ALLOCATION_REQUEST_ADAPTER
 )
 from .allocation_endpoints import allocate_impacts
 
@@ -32,6 +39,22 @@ logger.addHandler(file_handler)
 impact_calculator = ImpactCalculator()
 logger.info("Initialized ImpactCalculator service")
 
+# Form re-submissions usually repeat the last payload, so a single slot is the
+# default; raise it for deployments serving several concurrent users.
+IMPACT_CACHE_SIZE = int(os.getenv("ENVIRONMENTAL_IMPACT_CACHE_SIZE", "1"))
+
+@lru_cache(maxsize=IMPACT_CACHE_SIZE)
+def _calculate_impacts(process_inputs: ProcessInputsData) -> Tuple[Dict, Dict]:
+    """Run the impact calculator for a (hashable, frozen) set of process inputs"""
+    impact_results = impact_calculator.calculate_process_impacts(**asdict(process_inputs))
+    detailed_results = impact_calculator.get_detailed_results()
+    if not detailed_results:
+        logger.error("Failed to get detailed impact results")
+        raise RuntimeError("Failed to get detailed impact results")
+    # The detailed results reference the calculators' live contribution dicts,
+    # which the next calculation overwrites; cache a snapshot instead
+    return copy.deepcopy(impact_results), copy.deepcopy(detailed_results)
+
 class EnvironmentalAnalysisRequest(BaseModel):
     """Request model for environmental analysis"""
     request: ProcessInputs
@@ -140,13 +163,11 @@ async def analyze_process(
         
         # Calculate impacts
         logger.info("Calculating environmental impacts")
-        impact_results = impact_calculator.calculate_process_impacts(**process_inputs.dict())
+        impact_results, cached_results = _calculate_impacts(process_inputs.to_data())
         logger.debug(f"Impact Results: {impact_results}")
         
-        detailed_results = impact_calculator.get_detailed_results()
-        if not detailed_results:
-            logger.error("Failed to get detailed impact results")
-            raise RuntimeError("Failed to get detailed impact results")
+        # Shallow copy so the per-request edits below never leak into the cache
+        detailed_results = dict(cached_results)
         
         # Add process breakdown
         detailed_results['process_breakdown'] = {
@@ -165,24 +186,24 @@ async def analyze_process(
             
             try:
                 # Validate allocation data
-                if analysis_request.allocation_method == AllocationMethod.ECONOMIC and not analysis_request.product_values:
+                if analysis_request.allocation_method is AllocationMethod.ECONOMIC and not analysis_request.product_values:
                     raise ValueError("Product values required for economic allocation")
-                if analysis_request.allocation_method == AllocationMethod.PHYSICAL and not analysis_request.mass_flows:
+                if analysis_request.allocation_method is AllocationMethod.PHYSICAL and not analysis_request.mass_flows:
                     raise ValueError("Mass flows required for physical allocation")
-                if analysis_request.allocation_method == AllocationMethod.HYBRID:
+                if analysis_request.allocation_method is AllocationMethod.HYBRID:
                     if not analysis_request.product_values or not analysis_request.mass_flows:
                         raise ValueError("Product values and mass flows required for hybrid allocation")
                     if not analysis_request.hybrid_weights:
                         logger.info("Using research-based hybrid weights (0.6, 0.4)")
                         analysis_request.hybrid_weights = AllocationWeights(economic=0.6, physical=0.4)
             
-                allocation_data = AllocationRequest(
-                    impacts=impact_results,
-                    product_values=analysis_request.product_values or {},
-                    mass_flows=analysis_request.mass_flows or {},
-                    method=analysis_request.allocation_method,
-                    hybrid_weights=analysis_request.hybrid_weights
-                )
+                allocation_data = ALLOCATION_REQUEST_ADAPTER.validate_python({
+                    "impacts": impact_results,
+                    "product_values": analysis_request.product_values or {},
+                    "mass_flows": analysis_request.mass_flows or {},
+                    "method": analysis_request.allocation_method,
+                    "hybrid_weights": analysis_request.hybrid_weights
+                })
                 
                 logger.debug(f"Allocation Request: {allocation_data.dict()}")
                 allocation_response = await allocate_impacts(allocation_data)
@@ -218,23 +239,25 @@ async def analyze_process(
             detailed_results["process_contributions"] = {}
             logger.debug("Process contributions excluded from response")
             
-        response_data = ProcessAnalysisResponse(
-            status="success",
-            impact_results={
+        # Results come from our own calculators, so they are serialized as-is
+        # rather than re-validated; response_model documents the schema only
+        content = {
+            "status": "success",
+            "impact_results": {
                 **detailed_results,
                 "metadata": {
                     **detailed_results["metadata"],
                     "mass_flows": analysis_request.mass_flows or {}
                 }
             },
-            allocation_results=allocation_results,
-            suggested_allocation_method=suggested_method,
-            rf_validation=rf_validation
-        )
+            "allocation_results": allocation_results,
+            "suggested_allocation_method": suggested_method.value,
+            "rf_validation": rf_validation
+        }
         
         logger.info("RF process analysis completed successfully")
-        logger.debug(f"Response Data: {response_data.dict()}")
-        return response_data
+        logger.debug(f"Response Data: {content}")
+        return JSONResponse(content=content)
         
     except ValueError as e:
         log_validation_error(e, analysis_request.dict())
@@ -56,7 +56,7 @@ def _generate_cache_key(input_data: ParticleSizeInput) -> str:
     try:
         # Convert input data to a tuple of key components
         key_components = (
-            tuple(input_data.particle_sizes),
+            input_data.particle_sizes_np.tobytes(),
             tuple(input_data.weights) if input_data.weights else None,
             input_data.density,
             input_data.initial_moisture,
@@ -1,7 +1,12 @@
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional, TypeVar
 from datetime import datetime
+import asyncio
 import logging
+import threading
 
+import numpy as np
+
+from analytics.economic.profitability.npv import discount_cash_flows
 from analytics.economic.profitability_analyzer import ProfitabilityAnalysis, ProjectParameters
 from analytics.economic.services.cost_tracking import CostTracker
 from analytics.economic.capex_analyzer import CapitalExpenditureAnalysis
@@ -14,10 +19,23 @@ from backend.fastapi_app.models.economic_analysis import (
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 class ProfitabilityService:
-    def __init__(self):
+    def __init__(self, cost_tracker: Optional[CostTracker] = None):
         self._analyzer = ProfitabilityAnalysis()
-        self._cost_tracker = CostTracker()
+        # The analyzer holds the current project's data between calls, so only
+        # one analysis may use it at a time
+        self._analyzer_lock = threading.Lock()
+        # Share the caller's tracker so recorded analyses are visible to get_latest_analysis
+        self._cost_tracker = cost_tracker if cost_tracker is not None else CostTracker()
+
+    async def _run_in_thread(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a CPU-bound analysis in a worker thread while holding the analyzer lock"""
+        def run_exclusive() -> T:
+            with self._analyzer_lock:
+                return func(*args)
+        return await asyncio.to_thread(run_exclusive)
 
     def _create_project_parameters(self, input_data: ComprehensiveAnalysisInput) -> ProjectParameters:
         """Create project parameters from input data"""
@@ -33,6 +51,13 @@ class ProfitabilityService:
     async def analyze_comprehensive(
         self, 
         input_data: ComprehensiveAnalysisInput
+    ) -> Dict[str, Any]:
+        """Perform comprehensive profitability analysis off the event loop"""
+        return await self._run_in_thread(self._analyze_comprehensive, input_data)
+
+    def _analyze_comprehensive(
+        self, 
+        input_data: ComprehensiveAnalysisInput
     ) -> Dict[str, Any]:
         """Perform comprehensive profitability analysis"""
         try:
@@ -43,20 +68,15 @@ class ProfitabilityService:
             for equipment in input_data.equipment_list:
                 capex_analyzer.add_equipment(equipment.model_dump())
             
-            # Calculate total equipment cost for default indirect factors if needed
-            total_equipment_cost = sum(
-                equip.base_cost * (equip.processing_capacity / 1000)
-                for equip in input_data.equipment_list
-            )
-            
             # Add indirect factors
             if input_data.indirect_factors:
                 # Use provided indirect factors
                 for factor in input_data.indirect_factors:
                     capex_analyzer.add_indirect_factor(factor.model_dump())
-                logger.debug(f"Added {len(input_data.indirect_factors)} indirect factors from input")
+                logger.debug("Added %d indirect factors from input", len(input_data.indirect_factors))
             else:
-                # Use default indirect factors
+                # Use default indirect factors, based on the capacity-scaled equipment cost
+                total_equipment_cost = input_data.scaled_equipment_cost
                 default_factors = [
                     {
                         "name": "engineering",
@@ -150,11 +170,14 @@ class ProfitabilityService:
                 "maintenance_costs": opex_result["cost_breakdown"]["maintenance"]
             }
             
+            # Dump revenue data once; the analyzer and the metrics below share it
+            revenue_data = input_data.revenue_data.model_dump()
+            
             # Configure analyzer with calculated data
             self._analyzer.set_project_data(
                 capex=capex_data,
                 opex=opex_data,
-                revenue=input_data.revenue_data.model_dump(),
+                revenue=revenue_data,
                 parameters=parameters
             )
             
@@ -183,27 +206,32 @@ class ProfitabilityService:
             metrics["payback"] = {"value": payback_value}
             
             # Calculate annual revenue
-            revenue_data = input_data.revenue_data.model_dump()
             product_price = float(revenue_data["product_price"])
             annual_production = float(revenue_data["annual_production"])
             yield_efficiency = float(revenue_data.get("yield_efficiency"))
             
             annual_revenue = product_price * annual_production * yield_efficiency
-            logger.debug(f"Calculated annual revenue: {annual_revenue} from price={product_price}, production={annual_production}, yield={yield_efficiency}")
+            logger.debug(
+                "Calculated annual revenue: %s from price=%s, production=%s, yield=%s",
+                annual_revenue, product_price, annual_production, yield_efficiency
+            )
             
             # Calculate total annual costs
             total_annual_costs = opex_data["total_annual_cost"]
-            logger.debug(f"Total annual costs: {total_annual_costs}")
+            logger.debug("Total annual costs: %s", total_annual_costs)
             
             # Calculate operating income
             operating_income = annual_revenue - total_annual_costs
-            logger.debug(f"Operating income: {operating_income}")
+            logger.debug("Operating income: %s", operating_income)
             
-            # Calculate margins
+            # Split OPEX once into the fixed and variable parts used by every metric below
+            fixed_costs = opex_data["labor_costs"] + opex_data["maintenance_costs"]
             variable_costs = opex_data["raw_material_costs"] + opex_data["utility_costs"]
+            
+            # Calculate margins
             gross_margin = (annual_revenue - variable_costs) / annual_revenue if annual_revenue > 0 else 0.0
             operating_margin = operating_income / annual_revenue if annual_revenue > 0 else 0.0
-            logger.debug(f"Margins calculated - gross: {gross_margin}, operating: {operating_margin}")
+            logger.debug("Margins calculated - gross: %s, operating: %s", gross_margin, operating_margin)
             
             # Update metrics with calculated values
             metrics["margins"] = {
@@ -212,7 +240,6 @@ class ProfitabilityService:
             }
             
             # Update annual metrics
-            fixed_costs = opex_data["labor_costs"] + opex_data["maintenance_costs"]
             metrics["annual_metrics"] = {
                 "revenue": annual_revenue,
                 "operating_costs": opex_data["total_annual_cost"],
@@ -220,7 +247,7 @@ class ProfitabilityService:
                 "total_costs": total_annual_costs,
                 "effective_production": annual_production * yield_efficiency
             }
-            logger.debug(f"Annual metrics updated: {metrics['annual_metrics']}")
+            logger.debug("Annual metrics updated: %s", metrics['annual_metrics'])
             
             # Calculate break-even point
             if variable_costs > 0 and annual_production > 0:
@@ -243,7 +270,7 @@ class ProfitabilityService:
                 "unit_price": product_price,
                 "variable_cost_per_unit": variable_cost_per_unit
             }
-            logger.debug(f"Break-even metrics calculated: {metrics['break_even']}")
+            logger.debug("Break-even metrics calculated: %s", metrics['break_even'])
             
             # Format investment efficiency
             if "investment_efficiency" not in metrics:
@@ -254,8 +281,6 @@ class ProfitabilityService:
                 }
             
             # Format cost structure
-            fixed_costs = opex_data["labor_costs"] + opex_data["maintenance_costs"]
-            variable_costs = opex_data["raw_material_costs"] + opex_data["utility_costs"]
             total_costs = fixed_costs + variable_costs
             
             metrics["cost_structure"] = {
@@ -345,10 +370,14 @@ class ProfitabilityService:
             }
 
         except Exception as e:
-            logger.error(f"Error in comprehensive analysis: {str(e)}")
+            logger.error("Error in comprehensive analysis: %s", e)
             raise
 
     async def analyze_sensitivity(self, input_data: SensitivityAnalysisInput) -> Dict[str, Any]:
+        """Perform sensitivity analysis on economic metrics off the event loop"""
+        return await self._run_in_thread(self._analyze_sensitivity, input_data)
+
+    def _analyze_sensitivity(self, input_data: SensitivityAnalysisInput) -> Dict[str, Any]:
         """Perform sensitivity analysis on economic metrics"""
         try:
             # Get cost ratios from the input
@@ -376,7 +405,7 @@ class ProfitabilityService:
                 }
             }
         except Exception as e:
-            logger.error(f"Error in sensitivity analysis: {str(e)}")
+            logger.error("Error in sensitivity analysis: %s", e)
             raise
 
     async def get_latest_analysis(self, process_id: str) -> Optional[Dict[str, Any]]:
@@ -401,7 +430,7 @@ class ProfitabilityService:
             return latest_entry
             
         except Exception as e:
-            logger.error(f"Error getting latest analysis for process {process_id}: {str(e)}")
+            logger.error("Error getting latest analysis for process %s: %s", process_id, e)
             raise 
 
     def calculate_payback_period(self, cash_flows):
@@ -411,21 +440,18 @@ class ProfitabilityService:
         
         # Use total investment as initial outflow
         initial_investment = self._analyzer.capex_data["total_investment"]
-        cumulative = 0.0
         discount_rate = self._analyzer.parameters.discount_rate if self._analyzer.parameters else 0.1
 
-        for year, cash in enumerate(cash_flows[1:], start=1):
-            # Discount the cash flow
-            discounted_cash = cash / ((1 + discount_rate) ** year)
-            cumulative += discounted_cash
-            
-            if cumulative >= initial_investment:
-                # Calculate exact payback point within the year
-                remaining = initial_investment - (cumulative - discounted_cash)
-                fractional_year = remaining / discounted_cash
-                return year - 1 + fractional_year
-        
-        return float('inf')  # Never recovers investment
+        discounted = discount_cash_flows(cash_flows[1:], discount_rate)
+        cumulative = np.cumsum(discounted)
+        recovered = np.flatnonzero(cumulative >= initial_investment)
+        if not recovered.size:
+            return float('inf')  # Never recovers investment
+
+        # Calculate exact payback point within the first year that recovers it
+        i = recovered[0]
+        remaining = initial_investment - (cumulative[i] - discounted[i])
+        return float(i + remaining / discounted[i])
 
     def _calculate_metrics_rust(self, cash_flows, initial_investment):
         metrics = {}  # Initialize metrics dictionary
@@ -2,10 +2,14 @@ import ctypes
 import sys
 import logging
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+_DOUBLE_P = ctypes.POINTER(ctypes.c_double)
+
 class RustHandler:
     """Handles integration with Rust libraries for economic calculations"""
     
@@ -99,6 +103,15 @@ class RustHandler:
             ]
             self.lib.calculate_hybrid_allocation.restype = ctypes.c_bool
 
+            self.lib.calculate_hybrid_allocation_batch.argtypes = [
+                ctypes.POINTER(ctypes.c_double),  # economic_values
+                ctypes.POINTER(ctypes.c_double),  # mass_values
+                ctypes.c_size_t,                  # len
+                ctypes.c_double,                  # physical_weight
+                ctypes.POINTER(ctypes.c_double),  # results
+            ]
+            self.lib.calculate_hybrid_allocation_batch.restype = ctypes.c_bool
+
             # Configure eco-efficiency functions
             self.lib.calculate_efficiency.argtypes = [
                 ctypes.c_double,  # economic_value
@@ -114,6 +127,15 @@ class RustHandler:
             ]
             self.lib.calculate_eco_efficiency_matrix.restype = ctypes.c_bool
 
+            self.lib.calculate_eco_efficiency_summary.argtypes = [
+                ctypes.POINTER(ctypes.c_double),  # economic_values
+                ctypes.POINTER(ctypes.c_double),  # environmental_impacts
+                ctypes.c_size_t,                  # len
+                ctypes.POINTER(ctypes.c_double),  # results
+                ctypes.POINTER(ctypes.c_double),  # average
+            ]
+            self.lib.calculate_eco_efficiency_summary.restype = ctypes.c_bool
+
             # Configure particle distribution analysis
             self.lib.analyze_particle_distribution.argtypes = [
                 ctypes.POINTER(ctypes.c_double),  # sizes
@@ -281,49 +303,80 @@ class RustHandler:
 
     def calculate_allocation_factors(
         self,
-        impacts: List[float],
-        values: List[float]
+        impacts: "np.ndarray | List[float]",
+        values: "np.ndarray | List[float]"
     ) -> Dict[str, List[float]]:
         """
         Calculate allocation factors and allocated impacts using Rust implementation
         
         Args:
-            impacts: List of environmental impacts
-            values: List of economic/physical values for allocation
+            impacts: Environmental impacts (list or float64 array)
+            values: Economic/physical values for allocation, same length as impacts
             
         Returns:
             Dictionary containing allocation factors and allocated impacts
         """
         try:
-            if len(impacts) != len(values):
+            impacts = np.ascontiguousarray(impacts, dtype=np.float64)
+            values = np.ascontiguousarray(values, dtype=np.float64)
+            if impacts.shape != values.shape:
                 raise ValueError("Impacts and values lists must have the same length")
 
-            # Convert lists to C arrays
-            impacts_array = (ctypes.c_double * len(impacts))(*impacts)
-            values_array = (ctypes.c_double * len(values))(*values)
-            results_array = (ctypes.c_double * len(impacts))()
+            results = np.empty_like(impacts)
 
-            # Call Rust function
+            # Call Rust function on the array buffers directly
             success = self.lib.calculate_allocation(
-                impacts_array,
-                values_array,
-                len(impacts),
-                results_array
+                impacts.ctypes.data_as(_DOUBLE_P),
+                values.ctypes.data_as(_DOUBLE_P),
+                impacts.size,
+                results.ctypes.data_as(_DOUBLE_P)
             )
 
             if not success:
                 raise RuntimeError("Allocation calculation failed in Rust")
 
+            factors = np.divide(results, impacts, out=np.zeros_like(results), where=impacts != 0)
             return {
-                "allocation_factors": [results_array[i] / impacts[i] if impacts[i] != 0 else 0 
-                                     for i in range(len(impacts))],
-                "allocated_impacts": [results_array[i] for i in range(len(impacts))]
+                "allocation_factors": factors.tolist(),
+                "allocated_impacts": results.tolist()
             }
 
         except Exception as e:
             logger.error(f"Error in allocation calculation: {str(e)}", exc_info=True)
             raise RuntimeError(f"Allocation calculation failed: {str(e)}")
 
+    def calculate_allocation_shares(self, values: "np.ndarray | List[float]") -> np.ndarray:
+        """
+        Normalize per-product economic or physical values into allocation factors
+        
+        Args:
+            values: Economic/physical value of each product
+            
+        Returns:
+            Array of allocation factors summing to 1, one per product
+        """
+        try:
+            values = np.ascontiguousarray(values, dtype=np.float64)
+            # Unit impacts make the allocated impact of each product its factor
+            impacts = np.ones_like(values)
+            results = np.empty_like(values)
+
+            success = self.lib.calculate_allocation(
+                impacts.ctypes.data_as(_DOUBLE_P),
+                values.ctypes.data_as(_DOUBLE_P),
+                values.size,
+                results.ctypes.data_as(_DOUBLE_P)
+            )
+
+            if not success:
+                raise RuntimeError("Allocation calculation failed in Rust")
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Error in allocation share calculation: {str(e)}", exc_info=True)
+            raise RuntimeError(f"Allocation share calculation failed: {str(e)}")
+
     def calculate_hybrid_allocation_factors(
         self,
         mass_factors: List[float],
@@ -368,6 +421,49 @@ class RustHandler:
             logger.error(f"Error in hybrid allocation calculation: {str(e)}", exc_info=True)
             raise RuntimeError(f"Hybrid allocation calculation failed: {str(e)}")
 
+    def calculate_hybrid_allocation_batch(
+        self,
+        economic_values: np.ndarray,
+        mass_values: np.ndarray,
+        physical_weight: float
+    ) -> np.ndarray:
+        """
+        Calculate hybrid allocation factors from per-product values in one Rust call
+        
+        Args:
+            economic_values: Economic value of each product
+            mass_values: Mass flow of each product (same order as economic_values)
+            physical_weight: Weight for physical allocation (1-weight for economic)
+            
+        Returns:
+            Array of hybrid allocation factors, one per product
+        """
+        try:
+            economic = np.ascontiguousarray(economic_values, dtype=np.float64)
+            mass = np.ascontiguousarray(mass_values, dtype=np.float64)
+            if economic.shape != mass.shape:
+                raise ValueError("Economic and mass values must have the same length")
+
+            results = np.empty_like(economic)
+
+            # Pass the NumPy buffers straight through; no per-element copy into C arrays
+            success = self.lib.calculate_hybrid_allocation_batch(
+                economic.ctypes.data_as(_DOUBLE_P),
+                mass.ctypes.data_as(_DOUBLE_P),
+                economic.size,
+                physical_weight,
+                results.ctypes.data_as(_DOUBLE_P)
+            )
+
+            if not success:
+                raise RuntimeError("Hybrid allocation calculation failed in Rust")
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Error in batched hybrid allocation: {str(e)}", exc_info=True)
+            raise RuntimeError(f"Hybrid allocation calculation failed: {str(e)}")
+
     def calculate_eco_efficiency_matrix(
         self,
         economic_values: List[float],
@@ -406,6 +502,46 @@ class RustHandler:
             logger.error(f"Error in eco-efficiency matrix calculation: {str(e)}", exc_info=True)
             raise RuntimeError(f"Eco-efficiency matrix calculation failed: {str(e)}")
 
+    def calculate_eco_efficiency_summary(
+        self,
+        economic_values: "np.ndarray | List[float]",
+        environmental_impacts: "np.ndarray | List[float]"
+    ) -> Tuple[List[float], float]:
+        """
+        Calculate the eco-efficiency matrix and its mean in a single Rust call
+        
+        Args:
+            economic_values: Economic values (NPV, profit, etc.)
+            environmental_impacts: Environmental impacts paired with each economic value
+            
+        Returns:
+            Tuple of (eco-efficiency values, their average)
+        """
+        try:
+            values = np.ascontiguousarray(economic_values, dtype=np.float64)
+            impacts = np.ascontiguousarray(environmental_impacts, dtype=np.float64)
+            if impacts.size < values.size:
+                raise ValueError("Each economic value needs a paired environmental impact")
+            results = np.empty(values.size, dtype=np.float64)
+            average = ctypes.c_double()
+
+            success = self.lib.calculate_eco_efficiency_summary(
+                values.ctypes.data_as(_DOUBLE_P),
+                impacts.ctypes.data_as(_DOUBLE_P),
+                values.size,
+                results.ctypes.data_as(_DOUBLE_P),
+                ctypes.byref(average)
+            )
+
+            if not success:
+                raise RuntimeError("Eco-efficiency summary calculation failed in Rust")
+
+            return results.tolist(), average.value
+
+        except Exception as e:
+            logger.error(f"Error in eco-efficiency summary calculation: {str(e)}", exc_info=True)
+            raise RuntimeError(f"Eco-efficiency summary calculation failed: {str(e)}")
+
     def calculate_efficiency(
         self,
         economic_value: float,
@@ -443,8 +579,8 @@ class RustHandler:
         discount_rate: float = 0.1,
         fixed_cost_ratio: float = None,
         variable_cost_ratio: float = None
-    ) -> List[float]:
-        """Run sensitivity analysis using Rust implementation"""
+    ) -> np.ndarray:
+        """Run sensitivity analysis using Rust implementation, returning one NPV per step"""
         
         logger.info("\n=== Rust Sensitivity Analysis Parameters ===")
         logger.info(f"Variable Index: {variable_index}")
@@ -468,15 +604,15 @@ class RustHandler:
             logger.info(f"Variable Cost Ratio: {variable_cost_ratio:.4f}")
             logger.info(f"Ratio Sum Check: {fixed_cost_ratio + variable_cost_ratio:.4f}")
             
-            # Convert inputs to C types
-            values_array = (ctypes.c_double * len(base_values))(*base_values)
-            results_array = (ctypes.c_double * (steps + 1))()  # +1 for inclusive range
+            # Pass float64 buffers straight through to Rust
+            values = np.ascontiguousarray(base_values, dtype=np.float64)
+            results = np.empty(steps + 1, dtype=np.float64)  # +1 for inclusive range
             
             # Call Rust function
             logger.info("\nCalling Rust sensitivity_analysis function...")
             self.lib.run_sensitivity_analysis(
-                values_array,
-                len(base_values),
+                values.ctypes.data_as(_DOUBLE_P),
+                values.size,
                 variable_index,
                 range_min,
                 range_max,
@@ -484,11 +620,9 @@ class RustHandler:
                 discount_rate,
                 fixed_cost_ratio,
                 variable_cost_ratio,
-                results_array
+                results.ctypes.data_as(_DOUBLE_P)
             )
             
-            # Get results and log them
-            results = [results_array[i] for i in range(steps + 1)]
             logger.info(f"\nResults from Rust (first 3): {results[:3]}")
             logger.info(f"Results length: {len(results)}")
             
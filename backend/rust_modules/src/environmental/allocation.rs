@@ -1,5 +1,21 @@
 use std::ffi::c_double;
 
+/// Sum with four independent accumulators so the adds form separate
+/// dependency chains and LLVM can keep them in one vector register.
+#[inline]
+fn lane_sum(values: &[f64]) -> f64 {
+    let mut lanes = [0.0f64; 4];
+    let chunks = values.chunks_exact(4);
+    let tail: f64 = chunks.remainder().iter().sum();
+    for chunk in chunks {
+        lanes[0] += chunk[0];
+        lanes[1] += chunk[1];
+        lanes[2] += chunk[2];
+        lanes[3] += chunk[3];
+    }
+    (lanes[0] + lanes[1]) + (lanes[2] + lanes[3]) + tail
+}
+
 #[no_mangle]
 pub extern "C" fn calculate_allocation(
     impacts: *const c_double,
@@ -12,20 +28,17 @@ pub extern "C" fn calculate_allocation(
     let factors_slice = unsafe { std::slice::from_raw_parts_mut(allocation_factors, len) };
     
     // Calculate total value
-    let total_value: f64 = values_slice.iter().sum();
+    let total_value = lane_sum(values_slice);
     
     if total_value <= 0.0 {
         return false;
     }
     
-    // Calculate allocation factors
-    for i in 0..len {
-        factors_slice[i] = values_slice[i] / total_value;
-    }
-    
-    // Apply allocation factors to impacts
-    for i in 0..len {
-        factors_slice[i] *= impacts_slice[i];
+    // Calculate allocation factors and apply them to impacts in one pass;
+    // zipped slices carry no bounds checks, so the loop vectorizes
+    let inv_total = 1.0 / total_value;
+    for ((factor, &value), &impact) in factors_slice.iter_mut().zip(values_slice).zip(impacts_slice) {
+        *factor = value * inv_total * impact;
     }
     
     true
@@ -47,9 +60,46 @@ pub extern "C" fn calculate_hybrid_allocation(
     let w = weight.max(0.0).min(1.0);
     
     // Calculate hybrid factors
-    for i in 0..len {
-        results_slice[i] = w * mass_slice[i] + (1.0 - w) * economic_slice[i];
+    let economic_weight = 1.0 - w;
+    for ((result, &mass), &economic) in results_slice.iter_mut().zip(mass_slice).zip(economic_slice) {
+        *result = w * mass + economic_weight * economic;
     }
     
     true
-} 
\ No newline at end of file
+} 
+
+#[no_mangle]
+pub extern "C" fn calculate_hybrid_allocation_batch(
+    economic_values: *const c_double,
+    mass_values: *const c_double,
+    len: usize,
+    physical_weight: c_double,
+    results: *mut c_double
+) -> bool {
+    if economic_values.is_null() || mass_values.is_null() || results.is_null() || len == 0 {
+        return false;
+    }
+
+    let economic_slice = unsafe { std::slice::from_raw_parts(economic_values, len) };
+    let mass_slice = unsafe { std::slice::from_raw_parts(mass_values, len) };
+    let results_slice = unsafe { std::slice::from_raw_parts_mut(results, len) };
+
+    // Normalise each per-product vector once; no per-impact replication needed
+    let economic_total = lane_sum(economic_slice);
+    let mass_total = lane_sum(mass_slice);
+
+    if economic_total <= 0.0 || mass_total <= 0.0 {
+        return false;
+    }
+
+    // Fold the weights into the normalisation so each factor is one multiply-add
+    let w = physical_weight.max(0.0).min(1.0);
+    let mass_scale = w / mass_total;
+    let economic_scale = (1.0 - w) / economic_total;
+
+    for ((result, &mass), &economic) in results_slice.iter_mut().zip(mass_slice).zip(economic_slice) {
+        *result = mass_scale * mass + economic_scale * economic;
+    }
+
+    true
+}
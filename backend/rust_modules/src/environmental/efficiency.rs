@@ -12,6 +12,16 @@ pub extern "C" fn calculate_efficiency(
     economic_value / environmental_impact
 }
 
+/// Writes value / impact into `results` (0 for non-positive impacts) and returns their sum
+fn fill_eco_efficiency(values: &[f64], impacts: &[f64], results: &mut [f64]) -> f64 {
+    let mut total = 0.0;
+    for ((result, &value), &impact) in results.iter_mut().zip(values).zip(impacts) {
+        *result = if impact <= 0.0 { 0.0 } else { value / impact };
+        total += *result;
+    }
+    total
+}
+
 #[no_mangle]
 pub extern "C" fn calculate_eco_efficiency_matrix(
     economic_values: *const c_double,
@@ -23,13 +33,31 @@ pub extern "C" fn calculate_eco_efficiency_matrix(
     let impacts_slice = unsafe { std::slice::from_raw_parts(environmental_impacts, len) };
     let results_slice = unsafe { std::slice::from_raw_parts_mut(results, len) };
     
-    for i in 0..len {
-        if impacts_slice[i] <= 0.0 {
-            results_slice[i] = 0.0;
-        } else {
-            results_slice[i] = values_slice[i] / impacts_slice[i];
-        }
-    }
+    fill_eco_efficiency(values_slice, impacts_slice, results_slice);
     
     true
-} 
\ No newline at end of file
+}
+
+/// Eco-efficiency matrix plus its mean in one call, so callers need not re-reduce the matrix
+#[no_mangle]
+pub extern "C" fn calculate_eco_efficiency_summary(
+    economic_values: *const c_double,
+    environmental_impacts: *const c_double,
+    len: usize,
+    results: *mut c_double,
+    average: *mut c_double
+) -> bool {
+    if len == 0 || economic_values.is_null() || environmental_impacts.is_null()
+        || results.is_null() || average.is_null() {
+        return false;
+    }
+
+    let values_slice = unsafe { std::slice::from_raw_parts(economic_values, len) };
+    let impacts_slice = unsafe { std::slice::from_raw_parts(environmental_impacts, len) };
+    let results_slice = unsafe { std::slice::from_raw_parts_mut(results, len) };
+
+    let total = fill_eco_efficiency(values_slice, impacts_slice, results_slice);
+    unsafe { *average = total / len as f64; }
+
+    true
+}
@@ -1,5 +1,10 @@
 // Main library file
 
+// Many short-lived Vec allocations per FFI call; mimalloc's thread-local
+// size classes keep them cheap under concurrent API workers.
+#[global_allocator]
+static GLOBAL: mimalloc::MiMalloc = mimalloc::MiMalloc;
+
 pub mod economic;
 pub mod protein_analysis;
 pub mod environmental;
@@ -0,0 +1,124 @@
+import math
+import sys
+
+import numpy as np
+import orjson
+import pytest
+
+from backend.fastapi_app.models.environmental_analysis import AllocationMethod, AllocationRequest
+from backend.fastapi_app.process_analysis import allocation_endpoints
+
+
+@pytest.fixture
+def rust_handler():
+    """Rust handler shared by the allocation endpoints"""
+    return allocation_endpoints.rust_handler
+
+
+class TestRustAllocationWrappers:
+    """RustHandler allocation wrappers on per-product NumPy arrays"""
+
+    def test_allocation_shares(self, rust_handler):
+        """Shares are each value's fraction of the total"""
+        shares = rust_handler.calculate_allocation_shares(np.array([10.0, 30.0]))
+
+        assert shares.tolist() == pytest.approx([0.25, 0.75])
+
+    def test_hybrid_allocation_batch(self, rust_handler):
+        """Hybrid factors weigh the mass shares by physical_weight and the economic shares by the rest"""
+        factors = rust_handler.calculate_hybrid_allocation_batch(
+            np.array([10.0, 30.0]),
+            np.array([3.0, 1.0]),
+            0.4
+        )
+
+        # 0.4 * [0.75, 0.25] + 0.6 * [0.25, 0.75]
+        assert factors.tolist() == pytest.approx([0.45, 0.55])
+
+    def test_hybrid_allocation_batch_length_mismatch(self, rust_handler):
+        """Economic values and mass flows must describe the same products"""
+        with pytest.raises(RuntimeError, match="same length"):
+            rust_handler.calculate_hybrid_allocation_batch(
+                np.array([10.0, 30.0]),
+                np.array([3.0]),
+                0.4
+            )
+
+
+class TestPrepArrays:
+    """Cached per-product arrays"""
+
+    def test_mass_flows_follow_product_value_order(self):
+        """Mass flows are aligned to the product_values order"""
+        products, economic_values, mass_values = allocation_endpoints._prep_arrays(
+            (("protein_concentrate", 10.0), ("starch_fraction", 30.0)),
+            (("starch_fraction", 1.0), ("protein_concentrate", 3.0))
+        )
+
+        assert products == ("protein_concentrate", "starch_fraction")
+        assert economic_values.tolist() == [10.0, 30.0]
+        assert mass_values.tolist() == [3.0, 1.0]
+
+    def test_cached_arrays_are_read_only(self):
+        """Repeated product data returns the same read-only arrays"""
+        product_values = (("protein_concentrate", 12.0), ("starch_fraction", 2.0))
+        mass_flows = (("protein_concentrate", 0.22), ("starch_fraction", 0.78))
+
+        first = allocation_endpoints._prep_arrays(product_values, mass_flows)
+        second = allocation_endpoints._prep_arrays(product_values, mass_flows)
+
+        assert second[1] is first[1] and second[2] is first[2]
+        with pytest.raises(ValueError):
+            first[1][0] = 0.0
+
+
+class TestSanitizeFloats:
+    """Special float handling for JSON responses"""
+
+    def test_special_floats_are_replaced(self):
+        """NaN becomes 0.0 and infinities the largest finite float, at any depth"""
+        sanitized = allocation_endpoints.sanitize_floats({
+            "nan": math.nan,
+            "nested": {"inf": math.inf, "values": [-math.inf, 1.5]},
+            "pair": (math.nan, 2.0)
+        })
+
+        assert sanitized == {
+            "nan": 0.0,
+            "nested": {"inf": sys.float_info.max, "values": [-sys.float_info.max, 1.5]},
+            "pair": [0.0, 2.0]
+        }
+
+    def test_other_values_are_unchanged(self):
+        """Finite floats and non-float values pass through"""
+        assert allocation_endpoints.sanitize_floats({"method": "hybrid", "count": 2, "share": 0.5}) == {
+            "method": "hybrid",
+            "count": 2,
+            "share": 0.5
+        }
+
+
+class TestComputeAllocation:
+    """Allocation of impact totals with the Rust factors"""
+
+    def test_hybrid_allocation(self):
+        """Hybrid factors split every impact category between the products"""
+        request = AllocationRequest(
+            impacts={"gwp": 100.0, "water_consumption": 20.0},
+            product_values={"protein_concentrate": 10.0, "starch_fraction": 30.0},
+            mass_flows={"protein_concentrate": 3.0, "starch_fraction": 1.0},
+            method=AllocationMethod.HYBRID,
+            hybrid_weights={"economic": 0.6, "physical": 0.4}
+        )
+
+        result = orjson.loads(allocation_endpoints._compute_allocation(request).body)
+
+        assert result["allocation_factors"] == pytest.approx(
+            {"protein_concentrate": 0.45, "starch_fraction": 0.55}
+        )
+        assert result["results"]["allocated_impacts"]["gwp"] == pytest.approx(
+            {"protein_concentrate": 45.0, "starch_fraction": 55.0}
+        )
+        assert result["results"]["allocated_impacts"]["water_consumption"] == pytest.approx(
+            {"protein_concentrate": 9.0, "starch_fraction": 11.0}
+        )
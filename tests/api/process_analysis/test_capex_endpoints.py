@@ -134,4 +134,40 @@ def test_get_default_factors():
         "project_duration",
         "discount_rate",
         "production_volume"
-    ]) 
\ No newline at end of file
+    ]) 
+
+
+def test_equipment_breakdown_fields():
+    """Equipment breakdown lists only the cost fields, on every request to a pooled analyzer"""
+    equipment = Equipment(
+        name="Centrifuge",
+        base_cost=50000.0,
+        efficiency_factor=0.85,
+        installation_complexity=1.2,
+        maintenance_cost=2500.0,
+        energy_consumption=15.0,
+        processing_capacity=1000.0
+    )
+    
+    economic_factors = EconomicFactors(
+        installation_factor=0.2,
+        indirect_costs_factor=0.15,
+        maintenance_factor=0.05,
+        project_duration=10,
+        discount_rate=0.1,
+        production_volume=1000.0
+    )
+    
+    input_data = {
+        "equipment_list": [equipment.model_dump()],
+        "economic_factors": economic_factors.model_dump(),
+        "process_type": ProcessType.BASELINE,
+        "indirect_factors": [{"name": "Engineering", "cost": 10000.0, "percentage": 0.1}]
+    }
+    
+    for _ in range(2):
+        response = client.post("/api/v1/economic/capex/calculate", json=input_data)
+        assert response.status_code == 200
+        assert response.json()["equipment_breakdown"] == [
+            equipment.model_dump(exclude={"capacity_units"})
+        ]
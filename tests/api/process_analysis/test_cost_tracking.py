@@ -0,0 +1,47 @@
+from datetime import datetime
+
+import pytest
+
+from analytics.economic.services.cost_tracking import CostTracker
+
+
+@pytest.fixture
+def cost_tracker() -> CostTracker:
+    """Cost tracker with entries on three consecutive days"""
+    tracker = CostTracker()
+    for day, opex in ((1, 100.0), (2, 200.0), (3, 400.0)):
+        tracker.track_costs({
+            "timestamp": datetime(2024, 1, day).isoformat(),
+            "opex": {"utilities": opex}
+        })
+    return tracker
+
+
+class TestCostTracker:
+    """Bounded cost history and its date filters"""
+
+    def test_oldest_entries_are_evicted_at_max_entries(self):
+        """History keeps the newest max_entries entries and their timestamps"""
+        tracker = CostTracker(max_entries=2)
+        for day in (1, 2, 3):
+            tracker.track_costs({"timestamp": datetime(2024, 1, day).isoformat(), "capex": day})
+
+        assert [entry["capex"] for entry in tracker.cost_history] == [2.0, 3.0]
+        assert list(tracker._entry_times) == [datetime(2024, 1, 2), datetime(2024, 1, 3)]
+        assert tracker.get_cost_summary(start_date=datetime(2024, 1, 3)) == {"capex": 3.0}
+
+    def test_summary_within_date_range(self, cost_tracker: CostTracker):
+        """Start and end dates are inclusive"""
+        assert cost_tracker.get_cost_summary(
+            start_date=datetime(2024, 1, 2),
+            end_date=datetime(2024, 1, 3)
+        ) == {"opex_utilities": 600.0}
+        assert cost_tracker.get_cost_summary(end_date=datetime(2024, 1, 1)) == {"opex_utilities": 100.0}
+        assert cost_tracker.get_cost_summary() == {"opex_utilities": 700.0}
+
+    def test_invalid_timestamp_is_rejected(self, cost_tracker: CostTracker):
+        """An unparseable timestamp raises and leaves the history unchanged"""
+        with pytest.raises(ValueError, match="Failed to track costs"):
+            cost_tracker.track_costs({"timestamp": "last tuesday", "capex": 1.0})
+
+        assert len(cost_tracker.cost_history) == len(cost_tracker._entry_times) == 3
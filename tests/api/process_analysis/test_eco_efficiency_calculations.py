@@ -0,0 +1,150 @@
+from dataclasses import asdict
+from typing import Any, Dict
+
+import orjson
+import pytest
+
+from backend.fastapi_app.process_analysis import efficiency_endpoints
+
+
+@pytest.fixture
+def efficiency_metrics() -> Dict:
+    """Efficiency scores for an RF scenario, built with the endpoint's own helpers"""
+    return {
+        "economic_efficiency": efficiency_endpoints.calculate_economic_efficiency(
+            capex=1000000.0, opex=200000.0, production_volume=5000.0, product_price=100.0
+        ),
+        "environmental_efficiency": efficiency_endpoints.calculate_environmental_efficiency(
+            gwp=100.0, hct=50.0, frs=75.0, water=1000.0, production_volume=5000.0
+        ),
+        "technical_efficiency": efficiency_endpoints.calculate_technical_efficiency(
+            protein_recovery=80.0, separation_efficiency=90.0, process_efficiency=85.0
+        )
+    }
+
+
+@pytest.fixture
+def raw_request_body() -> bytes:
+    """Serialized /calculate request body"""
+    return orjson.dumps({
+        "economic_data": {
+            "capex": {"total_capex": 1000000.0},
+            "opex": {"total_annual_cost": 200000.0},
+            "production_volume": 5000.0,
+            "product_prices": {"main_product": 100.0},
+            "production_volumes": {"main_product": 5000.0},
+            "raw_material_cost": 150000.0
+        },
+        "quality_metrics": {
+            "protein_recovery": 80.0,
+            "separation_efficiency": 90.0,
+            "process_efficiency": 85.0,
+            "particle_size_distribution": {"D10": 5.0, "D50": 15.0, "D90": 30.0}
+        },
+        "environmental_impacts": {
+            "gwp": 100.0,
+            "hct": 50.0,
+            "frs": 75.0,
+            "water_consumption": 1000.0,
+            "allocated_impacts": {}
+        },
+        "resource_inputs": {"energy_consumption": 10000.0, "water_usage": 5000.0, "raw_material_input": 6000.0},
+        "process_type": "RF"
+    })
+
+
+@pytest.fixture
+def response_cache(monkeypatch):
+    """Empty /calculate response cache for the duration of a test"""
+    cache = efficiency_endpoints._ResponseCache(maxsize=4)
+    monkeypatch.setattr(efficiency_endpoints, "_ECO_EFFICIENCY_RESPONSES", cache)
+    return cache
+
+
+class TestEcoEfficiencyResponseCache:
+    """Caching of rendered /calculate responses"""
+
+    def test_fallback_response_is_not_cached(self, monkeypatch, response_cache, raw_request_body: bytes):
+        """A response computed without the Rust results is recomputed on the next request"""
+        def failing_summary(**kwargs: Any):
+            raise RuntimeError("Rust library unavailable")
+
+        monkeypatch.setattr(efficiency_endpoints.rust_handler, "calculate_eco_efficiency_summary", failing_summary)
+        body = efficiency_endpoints._eco_efficiency_body(raw_request_body)
+
+        assert "rust_calculations" not in orjson.loads(body)
+        assert response_cache.get(response_cache.key(raw_request_body)) is None
+
+        monkeypatch.setattr(
+            efficiency_endpoints.rust_handler,
+            "calculate_eco_efficiency_summary",
+            lambda **kwargs: ([1.0, 2.0], 1.5)
+        )
+        body = efficiency_endpoints._eco_efficiency_body(raw_request_body)
+
+        assert orjson.loads(body)["rust_calculations"]["matrix_indicators"]["average_efficiency"] == 1.5
+        assert response_cache.get(response_cache.key(raw_request_body)) == body
+
+    def test_cache_is_keyed_by_digest_and_bounded(self, response_cache):
+        """Keys are fixed-size digests and the least recently used entry is evicted"""
+        keys = [response_cache.key(bytes(size)) for size in (1, 10_000, 3, 4, 5)]
+        assert {len(key) for key in keys} == {32}
+
+        for key in keys:
+            response_cache.put(key, b"{}")
+
+        assert response_cache.get(keys[0]) is None
+        assert all(response_cache.get(key) == b"{}" for key in keys[1:])
+
+
+class TestEcoEfficiencyIndex:
+    """Eco-efficiency index and relative performance helpers"""
+
+    def test_relative_performance_without_precomputed_index(self, efficiency_metrics: Dict):
+        """The fallback path computes the index from the score dataclasses"""
+        index = efficiency_endpoints.calculate_eco_efficiency_index(efficiency_metrics, "rf")
+
+        assert efficiency_endpoints.calculate_relative_performance(
+            efficiency_metrics, "rf"
+        ) == efficiency_endpoints.calculate_relative_performance(efficiency_metrics, "rf", index)
+
+    def test_baseline_relative_performance(self, efficiency_metrics: Dict):
+        """Baseline is its own reference"""
+        assert efficiency_endpoints.calculate_relative_performance(
+            efficiency_metrics, "baseline"
+        ) == {"relative_improvement": 1.0}
+
+    def test_index_agrees_for_dataclass_and_mapping_scores(self, efficiency_metrics: Dict):
+        """Score dataclasses and their dict form weigh the same groups the same way"""
+        as_mappings = {group: asdict(scores) for group, scores in efficiency_metrics.items()}
+
+        index = efficiency_endpoints.calculate_eco_efficiency_index(efficiency_metrics, "rf")
+
+        assert index == pytest.approx(
+            efficiency_endpoints.calculate_eco_efficiency_index(as_mappings, "rf"), rel=1e-15
+        )
+        assert index == pytest.approx(sum(
+            weight * sum(as_mappings[group].values()) / len(as_mappings[group])
+            for group, weight in efficiency_endpoints._INDEX_WEIGHTS
+        ))
+
+    def test_calculate_response_uses_shared_index(self, monkeypatch, raw_request_body: bytes):
+        """/calculate reports the index of the metrics it returns"""
+        monkeypatch.setattr(
+            efficiency_endpoints.rust_handler,
+            "calculate_eco_efficiency_summary",
+            lambda **kwargs: ([1.0, 2.0], 1.5)
+        )
+        request = efficiency_endpoints._ECO_EFFICIENCY_ADAPTER.validate_json(raw_request_body)
+        response_data, _ = efficiency_endpoints._compute_eco_efficiency(request)
+
+        metrics = response_data["efficiency_metrics"]
+        index = response_data["performance_indicators"]["eco_efficiency_index"]
+
+        assert index == efficiency_endpoints.calculate_eco_efficiency_index(metrics, "rf")
+        assert index == pytest.approx(
+            efficiency_endpoints.calculate_eco_efficiency_index(
+                {group: asdict(scores) for group, scores in metrics.items()}, "rf"
+            ),
+            rel=1e-15
+        )
@@ -0,0 +1,77 @@
+import copy
+from functools import lru_cache
+from typing import Dict
+
+import pytest
+
+from backend.fastapi_app.models.environmental_analysis import ProcessAnalysisResponse, ProcessInputs
+from backend.fastapi_app.process_analysis import environmental_endpoints
+
+
+@pytest.fixture
+def process_inputs() -> Dict:
+    """Valid RF process inputs for the impact calculator"""
+    return {
+        "rf_electricity_kwh": 0.0363,
+        "rf_temperature_outfeed_c": 86.0,
+        "rf_temperature_electrode_c": 100.0,
+        "rf_anode_current_a": 0.5,
+        "rf_grid_current_a": 0.3,
+        "air_classifier_milling_kwh": 0.04,
+        "air_classification_kwh": 0.04,
+        "hammer_milling_kwh": 0.025,
+        "dehulling_kwh": 0.03,
+        "tempering_water_kg": 0.05,
+        "initial_moisture_content": 0.17,
+        "final_moisture_content": 0.135,
+        "target_moisture_content": 0.125,
+        "product_kg": 1.0,
+        "equipment_kg": 100.0,
+        "waste_kg": 0.1,
+        "transport_ton_km": 0.5
+    }
+
+
+class TestImpactCache:
+    """Cached impact results must not change when other inputs are calculated"""
+
+    def test_cache_hit_keeps_own_contributions(self, process_inputs: Dict):
+        """A, B, A with room for both entries returns A's original contributions"""
+        calculate = lru_cache(maxsize=4)(environmental_endpoints._calculate_impacts.__wrapped__)
+        inputs_a = ProcessInputs(**process_inputs).to_data()
+        inputs_b = ProcessInputs(**{**process_inputs, "rf_electricity_kwh": 0.2}).to_data()
+
+        first_a = copy.deepcopy(calculate(inputs_a))
+        _, detailed_b = calculate(inputs_b)
+        impacts_a, detailed_a = calculate(inputs_a)
+
+        assert calculate.cache_info().hits == 1
+        assert (impacts_a, detailed_a) == first_a
+        assert (
+            detailed_a["process_contributions"]["gwp"]["electricity"]
+            != detailed_b["process_contributions"]["gwp"]["electricity"]
+        )
+
+
+class TestAnalyzeProcessResponse:
+    """The unvalidated /analyze-process response must still match its declared schema"""
+
+    def test_response_matches_response_model(self, client, process_inputs: Dict):
+        """Hybrid allocation results and impact results validate as ProcessAnalysisResponse"""
+        response = client.post(
+            "/api/v1/environmental/impact/analyze-process",
+            json={
+                "request": process_inputs,
+                "allocation_method": "hybrid",
+                "product_values": {"protein_concentrate": 5.0, "starch_fraction": 0.8},
+                "mass_flows": {"protein_concentrate": 0.3, "starch_fraction": 0.7}
+            }
+        )
+
+        assert response.status_code == 200
+        result = ProcessAnalysisResponse.model_validate(response.json())
+        assert result.allocation_results is not None
+        assert result.impact_results.metadata["mass_flows"] == {
+            "protein_concentrate": 0.3,
+            "starch_fraction": 0.7
+        }